@@ -1,21 +1,71 @@
 """API routes"""
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 
+from digital_folder.core.rate_limit import rate_limit
+from digital_folder.packages.Batch.routers import batch_router
+from digital_folder.packages.Change.routers import change_router
 from digital_folder.packages.Group.routers import group_router
 from digital_folder.packages.Project.routers import project_router
 from digital_folder.packages.Server.routers import server_router
+from digital_folder.packages.Sync.routers import sync_router
 from digital_folder.packages.Tag.routers import tag_router
 from digital_folder.packages.Ticket.routers import ticket_router
 from digital_folder.packages.User.routers import user_router
 from digital_folder.supabase.storage import supabase_router
 
+# Admission limits (AdmissionMiddleware) match the prefixes below, ex: "/projects"
+API_PREFIX = "/api"
+
 api_router = APIRouter()
 
-api_router.include_router(group_router, prefix="/groups", tags=["groups"])
-api_router.include_router(project_router, prefix="/projects", tags=["projects"])
+api_router.include_router(batch_router, prefix="/batch", tags=["batch"])
+api_router.include_router(
+    change_router,
+    prefix="/changes",
+    tags=["changes"],
+    dependencies=[Depends(rate_limit("changes"))],
+)
+api_router.include_router(
+    group_router,
+    prefix="/groups",
+    tags=["groups"],
+    dependencies=[Depends(rate_limit("groups"))],
+)
+api_router.include_router(
+    project_router,
+    prefix="/projects",
+    tags=["projects"],
+    dependencies=[Depends(rate_limit("projects"))],
+)
 api_router.include_router(server_router, prefix="/server", tags=["server"])
-api_router.include_router(tag_router, prefix="/tags", tags=["tags"])
-api_router.include_router(ticket_router, prefix="/tickets", tags=["tickets"])
-api_router.include_router(user_router, prefix="/users", tags=["users"])
-api_router.include_router(supabase_router, prefix="/supabase", tags=["supabase"])
+api_router.include_router(
+    sync_router,
+    prefix="/sync",
+    tags=["sync"],
+    dependencies=[Depends(rate_limit("sync"))],
+)
+api_router.include_router(
+    tag_router,
+    prefix="/tags",
+    tags=["tags"],
+    dependencies=[Depends(rate_limit("tags"))],
+)
+api_router.include_router(
+    ticket_router,
+    prefix="/tickets",
+    tags=["tickets"],
+    dependencies=[Depends(rate_limit("tickets"))],
+)
+api_router.include_router(
+    user_router,
+    prefix="/users",
+    tags=["users"],
+    dependencies=[Depends(rate_limit("users", by="ip"))],
+)
+api_router.include_router(
+    supabase_router,
+    prefix="/supabase",
+    tags=["supabase"],
+    dependencies=[Depends(rate_limit("supabase"))],
+)
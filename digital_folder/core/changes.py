@@ -0,0 +1,210 @@
+"""Change feed"""
+
+import asyncio
+import logging
+import uuid
+from threading import Lock
+from typing import Callable, Optional, Union
+
+import orjson
+from pydantic import BaseModel
+
+from digital_folder.core.config import project_settings
+from digital_folder.db.db import Base, engine
+from digital_folder.packages.Change.schemas import ChangeEvent
+
+logger = logging.getLogger(__name__)
+
+# Identifies this worker in NOTIFY payloads, so it skips its own changes
+WORKER_ID = uuid.uuid4().hex
+
+# Sent to a subscriber that fell behind and lost events, it should refetch everything
+RESYNC = "resync"
+
+
+class ChangeNotification(BaseModel):
+    """Change Notification schema, the NOTIFY payload"""
+
+    worker: str
+    # Written collection (table), ex: "project_urls"
+    collection: str
+    # None for collections clients don't see, ex: "users"
+    event: Optional[ChangeEvent] = None
+
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop, max_queue: int):
+        """
+        Queue of the change events of a single stream, fed from any thread.
+
+        Args:
+            loop (asyncio.AbstractEventLoop): The event loop of the stream.
+            max_queue (int): Max events waiting to be sent before the stream has to resync.
+        """
+
+        self.loop = loop
+        self.queue: asyncio.Queue[Union[ChangeEvent, str]] = asyncio.Queue(max_queue)
+
+    def put(self, event: ChangeEvent) -> None:
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog, the client refetches instead
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(RESYNC)
+
+    async def get(self) -> Union[ChangeEvent, str]:
+        return await self.queue.get()
+
+
+class ChangeBus:
+    def __init__(self, max_queue: int):
+        """
+        In-process pub/sub of change events, from DbService writes to the change streams.
+
+        Args:
+            max_queue (int): Max events waiting per subscriber.
+        """
+
+        self.max_queue = max_queue
+        self.subscriptions: set[Subscription] = set()
+        self._lock = Lock()
+
+    def subscribe(self) -> Subscription:
+        """
+        Subscribe to every change event. Must be called from the event loop.
+
+        Returns:
+            Subscription: The event queue, unsubscribe it once done.
+        """
+
+        subscription = Subscription(asyncio.get_running_loop(), self.max_queue)
+        with self._lock:
+            self.subscriptions.add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self.subscriptions.discard(subscription)
+
+    def publish(self, event: ChangeEvent) -> None:
+        """
+        Send an event to every subscriber. Thread-safe, writes run in the db executor.
+
+        Args:
+            event (ChangeEvent): The change event.
+        """
+
+        with self._lock:
+            subscriptions = list(self.subscriptions)
+
+        for subscription in subscriptions:
+            subscription.loop.call_soon_threadsafe(subscription.put, event)
+
+
+change_bus = ChangeBus(max_queue=project_settings.changes_max_queue)
+
+
+class ChangeListener:
+    def __init__(self, on_change: Callable[[str, Optional[ChangeEvent]], None]):
+        """
+        LISTEN to the changes NOTIFY'ed by the other workers on a dedicated connection,
+        outside of the pool, read from the event loop without a thread.
+        Reconnects after a failure, then reports every collection as changed since
+        notifications sent meanwhile are lost.
+
+        Args:
+            on_change (Callable[[str, Optional[ChangeEvent]], None]): Called with the written
+            collection and the change event, if clients can see it.
+        """
+
+        self.on_change = on_change
+        self.connection = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        # Set while notifications may be missed, from a failure until the next connection
+        self.lost = False
+
+    def start(self) -> None:
+        self.loop = asyncio.get_running_loop()
+        self.connect()
+
+    def stop(self) -> None:
+        self.disconnect()
+        self.loop = None
+
+    def connect(self) -> None:
+        if self.loop is None:
+            return
+
+        try:
+            cargs, cparams = engine.dialect.create_connect_args(engine.url)
+            self.connection = engine.dialect.connect(*cargs, **cparams)
+            self.connection.autocommit = True
+            with self.connection.cursor() as cursor:
+                cursor.execute(f'LISTEN "{project_settings.changes_channel}"')
+        except Exception as exc:
+            logger.warning("Change listener failed to connect: %r", exc)
+            self.disconnect()
+            self.lost = True
+            self.loop.call_later(project_settings.changes_reconnect_delay, self.connect)
+            return
+
+        self.loop.add_reader(self.connection.fileno(), self.read)
+
+        if self.lost:
+            self.lost = False
+            for collection in Base.metadata.tables:
+                self.on_change(collection, None)
+
+    def disconnect(self) -> None:
+        if self.connection is None:
+            return
+
+        try:
+            if self.loop is not None:
+                self.loop.remove_reader(self.connection.fileno())
+            self.connection.close()
+        except Exception:
+            pass
+        self.connection = None
+
+    def read(self) -> None:
+        try:
+            self.connection.poll()
+        except Exception as exc:
+            logger.warning("Change listener lost its connection: %r", exc)
+            self.disconnect()
+            self.lost = True
+            self.loop.call_later(project_settings.changes_reconnect_delay, self.connect)
+            return
+
+        while self.connection.notifies:
+            payload = self.connection.notifies.pop(0).payload
+            try:
+                notification = ChangeNotification.model_validate_json(payload)
+            except ValueError:
+                continue
+
+            if notification.worker != WORKER_ID:
+                self.on_change(notification.collection, notification.event)
+
+
+def notification_payload(collection: str, event: Optional[ChangeEvent]) -> str:
+    """
+    Build the NOTIFY payload of a write.
+
+    Args:
+        collection (str): The written collection (table).
+        event (Optional[ChangeEvent]): The change event, if clients can see it.
+
+    Returns:
+        str: The JSON payload.
+    """
+
+    return orjson.dumps(
+        ChangeNotification(
+            worker=WORKER_ID, collection=collection, event=event
+        ).model_dump(mode="json")
+    ).decode()
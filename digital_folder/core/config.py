@@ -1,7 +1,7 @@
 """Core settings"""
 
 import os
-from typing import List, Optional
+from typing import List, Literal, Optional
 
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
@@ -25,15 +25,146 @@ class ProjectSettings(ProjectSettingsBase):
     debug: Optional[bool] = False
     env: str
     port: Optional[int] = None
+    # Default JSON encoder for responses
+    response_class: Literal["orjson", "json"] = "orjson"
+    # ETag + If-None-Match on read routes
+    etag_enabled: bool = True
+    # Per-request phase timings (sql, storage, serialize...) logged as JSON, and sent
+    # in a Server-Timing header if 'request_timing_header'
+    request_timing_enabled: bool = False
+    request_timing_header: bool = True
+    # Prometheus metrics at /server/metrics, scraped with this bearer token if set.
+    # Without a token, anyone reaching the API can read the routes, pool and cache stats
+    metrics_enabled: bool = False
+    metrics_token: Optional[SecretStr] = None
+    # Directory shared by the workers of a host, so a scrape served by any worker
+    # includes all of them. Empty it on deploy. None only exposes the serving worker
+    metrics_dir: Optional[str] = None
+    # Seconds
+    metrics_flush_interval: float = 10
+    # Statements slower than the threshold (ms) are logged with their EXPLAIN plan, for a
+    # 'slow_query_sample_rate' share of them, and ranked for admins at /server/slow_queries
+    slow_query_enabled: bool = True
+    slow_query_threshold_ms: float = 200
+    slow_query_sample_rate: float = 1.0
+    slow_query_explain: bool = True
+    slow_query_top_n: int = 20
+    # Seconds a statement stays ranked after it was last slow
+    slow_query_window: float = 3600
 
     # Database
     dev_database_url: Optional[str] = None
     prod_database_url: str
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    # Seconds to wait for a free connection
+    db_pool_timeout: int = 30
+    # DTO work beyond one call per connection waits in a bounded queue, for at most the timeout (seconds)
+    db_executor_queue: int = 64
+    db_executor_queue_timeout: float = 10
 
     # JWT
     jwt_secret_key: SecretStr
     jwt_algorithm: str
     access_token_expires_in: int
+    # Minutes, defaults to 30 days
+    refresh_token_expires_in: int = 43200
+    # "minimal" only signs the user id, "full" also signs role, username and filter_id
+    jwt_claims_mode: Literal["minimal", "full"] = "minimal"
+    # Bump to revoke every token issued with a previous version
+    jwt_token_version: int = 1
+    # Max decoded tokens kept per worker, 0 disables the cache
+    jwt_cache_size: int = 1024
+
+    # Password verification (bcrypt)
+    password_verify_workers: int = 2
+    password_verify_queue: int = 8
+
+    # Compression
+    compression_enabled: bool = True
+    compression_minimum_size: int = 1024
+    compression_level: int = 6
+    compression_brotli: bool = False
+    compression_content_types: List[str] = [
+        "application/json",
+        "text/html",
+        "text/plain",
+    ]
+
+    # Admission control, max concurrent requests per route prefix (under /api) and per role.
+    # 0 = unlimited, requests over a limit wait in a bounded queue then fail with 503.
+    # Exempt routes hold their connection open (streams) and skip admission
+    admission_enabled: bool = True
+    admission_route_limits: dict[str, int] = {
+        "/projects": 32,
+        "/tags": 32,
+        "/groups": 32,
+        "/tickets": 16,
+        "/supabase": 8,
+        "/users": 16,
+        "/server": 0,
+        "/batch": 16,
+        "/sync": 16,
+    }
+    admission_role_limits: dict[str, int] = {"VIEWER": 48, "USER": 16, "ADMIN": 0}
+    admission_exempt_routes: List[str] = ["/changes"]
+    admission_queue: int = 64
+    # Seconds
+    admission_queue_timeout: float = 5
+
+    # Change feed (/changes/stream). Writes are NOTIFY'ed on the channel so every worker
+    # drops its caches and streams them, not only the worker that made them
+    changes_notify_enabled: bool = True
+    changes_channel: str = "digital_folder_changes"
+    # Max events waiting per stream, a stream that falls behind is sent "resync"
+    changes_max_queue: int = 256
+    # Seconds
+    changes_keepalive: float = 15
+    changes_client_retry: float = 3
+    changes_reconnect_delay: float = 5
+
+    # Idempotency-Key on create and upload routes, stored responses are replayed for the TTL (seconds)
+    idempotency_enabled: bool = True
+    idempotency_ttl: int = 86400
+    idempotency_max_keys: int = 10000
+
+    # Max changes per /sync response
+    sync_page_size: int = 500
+
+    # Max sub-requests per /batch request
+    batch_max_requests: int = 20
+
+    # Rate limits, router -> (requests per minute, burst) per user, per client IP for /users
+    rate_limit_enabled: bool = True
+    rate_limits: dict[str, tuple[float, int]] = {
+        "projects": (600, 60),
+        "tags": (600, 60),
+        "groups": (600, 60),
+        "tickets": (60, 10),
+        "supabase": (60, 20),
+        "users": (20, 10),
+        "changes": (30, 10),
+        "sync": (120, 20),
+    }
+    # Max buckets kept per worker
+    rate_limit_max_keys: int = 10000
+
+    # Caches (seconds)
+    role_cache_ttl: int = 300
+    fragment_cache_ttl: int = 30
+    fragment_cache_size: int = 2048
+    response_cache_enabled: bool = True
+    response_cache_ttl: int = 30
+    response_cache_size: int = 256
+    # Concurrent identical reads share one computation
+    request_coalescing_enabled: bool = True
+    # Viewer reads, router -> (fresh, max stale): outdated responses are served
+    # up to fresh + max stale seconds old while one background task refreshes them
+    stale_while_revalidate: dict[str, tuple[int, int]] = {
+        "projects": (10, 300),
+        "tags": (30, 600),
+        "groups": (30, 600),
+    }
 
     # Supabase
     project_url: str
@@ -1,13 +1,18 @@
+from typing import Iterator
 from uuid import UUID
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt, JWTError
+from jose import JWTError
 
 from digital_folder.core.config import project_settings
 from digital_folder.db.dependencies import get_db
-from digital_folder.db.models import User
 from digital_folder.db.service import DbService
+from digital_folder.packages.AccessToken.dto import (
+    decode_access_token,
+    is_self_contained,
+)
+from digital_folder.packages.User.cache import remember_role
 from digital_folder.packages.User.dto import UserDTO
 from digital_folder.packages.User.schemas import (
     UserDb,
@@ -18,13 +23,18 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
 
 
 def validate_user(
-    db: DbService = Depends(get_db), token: str = Depends(oauth2_scheme)
+    request: Request,
+    db: DbService = Depends(get_db),
+    token: str = Depends(oauth2_scheme),
 ) -> UserDb:
     """
     Validate and decode the JWT access token, then return the authenticated user.
     This dependency is used to protect routes that require authentication.
+    Tokens signed in "full" claims mode are trusted as is and skip the users table lookup.
+    Sub-requests of a batch reuse the user of the batch request.
 
     Args:
+        request (Request): The request.
         db (DbService): The database service dependency.
         token (str): The JWT access token extracted from the Authorization header.
 
@@ -32,12 +42,12 @@ def validate_user(
         UserDb: The authenticated user, including role and environment data.
     """
 
+    batch_db = getattr(request.state, "batch_db", None)
+    if batch_db is not None:
+        return batch_db.user
+
     try:
-        payload = jwt.decode(
-            token,
-            project_settings.jwt_secret_key.get_secret_value(),
-            algorithms=[project_settings.jwt_algorithm],
-        )
+        payload = decode_access_token(token)
 
         user_id = UUID(payload.get("id"))
         if not user_id:
@@ -49,21 +59,31 @@ def validate_user(
     except JWTError:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="JWTError")
 
-    user = UserDTO(db).get_by_id(user_id)
+    if is_self_contained(payload):
+        filter_id = payload.get("filter_id")
 
-    role_config = {
-        UserRole.ADMIN: None,
-        UserRole.USER: user.id,
-        UserRole.VIEWER: UserDTO(db).get_by_field(User.role, UserRole.ADMIN).id,
-    }
+        return UserDb(
+            id=user_id,
+            username=payload.get("username"),
+            role=UserRole(payload.get("role")),
+            env=project_settings.env.lower(),
+            filter_id=UUID(filter_id) if filter_id else None,
+        )
 
-    return UserDb(
+    user_dto = UserDTO(db)
+    user = user_dto.get_by_id(user_id)
+    user_db = UserDb(
         id=user.id,
         username=user.username,
         role=user.role,
         env=project_settings.env.lower(),
-        filter_id=role_config[user.role],
+        filter_id=user_dto.get_filter_id(user),
     )
+    remember_role(user_db.id, user_db.role)
+    # The request may wait for the db executor, don't hold a connection meanwhile
+    db.release()
+
+    return user_db
 
 
 def validate_role(user: UserDb = Depends(validate_user)) -> UserDb:
@@ -85,11 +105,49 @@ def validate_role(user: UserDb = Depends(validate_user)) -> UserDb:
     return user
 
 
-def get_db_validate_user(user: UserDb = Depends(validate_user)):
-    with DbService(user) as db:
-        yield db
+def validate_admin(user: UserDb = Depends(validate_user)) -> UserDb:
+    """
+    Protect server internals, ex: the slow query log, by checking if user is an admin.
+
+    Args:
+        user (UserDb): The authenticated user returned by 'validate_user'.
+
+    Returns:
+        UserDb: The user if is an admin.
+    """
+
+    if user.role != UserRole.ADMIN:
+        raise HTTPException(
+            status_code=403,
+            detail=f"User '{user.username}' does not have permission to perform this action.",
+        )
+    return user
+
+
+def get_db_validate_user(request: Request, user: UserDb = Depends(validate_user)):
+    yield from open_db(request, user)
+
+
+def get_db_validate_role(request: Request, user: UserDb = Depends(validate_role)):
+    yield from open_db(request, user)
+
+
+def open_db(request: Request, user: UserDb) -> Iterator[DbService]:
+    """
+    Open the db session of a request, or reuse the batch request one for its sub-requests.
+
+    Args:
+        request (Request): The request.
+        user (UserDb): The authenticated user.
+
+    Yields:
+        DbService: The db session.
+    """
 
+    batch_db = getattr(request.state, "batch_db", None)
+    if batch_db is not None:
+        yield batch_db
+        return
 
-def get_db_validate_role(user: UserDb = Depends(validate_role)):
     with DbService(user) as db:
         yield db
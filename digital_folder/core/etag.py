@@ -0,0 +1,75 @@
+"""Conditional GET"""
+
+import hashlib
+import uuid
+from typing import Iterable
+
+from fastapi import HTTPException, Request, status
+
+from digital_folder.core.config import project_settings
+from digital_folder.core.responses import add_response_headers
+from digital_folder.db.service import DbService
+
+# Versions restart at 0 with the process, so ETags from a previous process must never match
+BOOT_ID = uuid.uuid4().hex
+
+
+def make_etag(request: Request, db: DbService, collections: Iterable[str]) -> str:
+    """
+    Build a strong ETag for a read request from the versions of the collections it reads,
+    the user scope and the query params.
+
+    Args:
+        request (Request): The request.
+        db (DbService): The db session, holding the user and the collection versions.
+        collections (Iterable[str]): The collections (tables) the response is built from.
+
+    Returns:
+        str: The quoted ETag.
+    """
+
+    versions = [
+        (collection, db.versions.get(collection, 0)) for collection in collections
+    ]
+    raw = "|".join(
+        [
+            BOOT_ID,
+            request.url.path,
+            str(sorted(request.query_params.multi_items())),
+            str(db.user.filter_id),
+            str(versions),
+        ]
+    )
+
+    return f'"{hashlib.sha256(raw.encode()).hexdigest()[:32]}"'
+
+
+def check_etag(request: Request, db: DbService, collections: Iterable[str]) -> None:
+    """
+    Answer 304 Not Modified when the client already holds the current version of the response.
+    Must be called before any query, the ETag only depends on in-memory versions.
+    Otherwise the ETag is added to the response.
+
+    Args:
+        request (Request): The request.
+        db (DbService): The db session, holding the user and the collection versions.
+        collections (Iterable[str]): The collections (tables) the response is built from.
+    """
+
+    if not project_settings.etag_enabled:
+        return
+
+    etag = make_etag(request, db, collections)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        client_etags = {
+            value.strip().removeprefix("W/") for value in if_none_match.split(",")
+        }
+        if etag in client_etags or "*" in client_etags:
+            raise HTTPException(
+                status_code=status.HTTP_304_NOT_MODIFIED, headers=headers
+            )
+
+    add_response_headers(request, headers)
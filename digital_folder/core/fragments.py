@@ -0,0 +1,40 @@
+"""Serialized fragment cache"""
+
+from typing import Hashable
+from uuid import UUID
+
+from digital_folder.core.config import project_settings
+from digital_folder.db.service import DbService
+from digital_folder.helpers.cache import LRUCache
+
+# Parsed tag and group objects shared by every request. Keys carry the tags and groups
+# collection versions, so writes make old fragments unreachable (LRU evicts them).
+# The TTL bounds staleness when another worker did the write.
+fragment_cache = LRUCache(
+    maxsize=project_settings.fragment_cache_size,
+    ttl=project_settings.fragment_cache_ttl,
+)
+
+
+def fragment_key(db: DbService, kind: str, obj_id: UUID, variant: Hashable) -> tuple:
+    """
+    Build the fragment cache key of a tag or group object.
+    Tags embed their group and groups expose 'has_tags', so both depend on both collections.
+
+    Args:
+        db (DbService): The db session, holding the collection versions it reads from.
+        kind (str): The fragment kind, ex: "tag".
+        obj_id (UUID): The object ID.
+        variant (Hashable): What distinguishes fragments of the same object, ex: with or without group.
+
+    Returns:
+        tuple: The cache key.
+    """
+
+    return (
+        kind,
+        obj_id,
+        variant,
+        db.versions.get("tags", 0),
+        db.versions.get("groups", 0),
+    )
@@ -0,0 +1,251 @@
+"""Idempotency keys"""
+
+import asyncio
+import hashlib
+import time
+from abc import ABC, abstractmethod
+from threading import Lock
+from typing import Any, Awaitable, Callable, Optional
+
+import orjson
+from fastapi import HTTPException, Request, status
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from digital_folder.core.config import project_settings
+from digital_folder.core.responses import build_trusted_response
+from digital_folder.helpers.cache import LRUCache
+from digital_folder.packages.User.schemas import UserDb
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+
+
+class StoredResponse(BaseModel):
+    """Stored Response schema"""
+
+    # Hash of the request payload, a key can't be reused for another request
+    fingerprint: str
+    # None while the first request is running
+    status_code: Optional[int] = None
+    body: bytes = b""
+    media_type: Optional[str] = None
+    created_at: float
+
+
+class IdempotencyBackend(ABC):
+    """
+    TTL storage of the responses of requests sent with an Idempotency-Key.
+    Subclass it to share the keys between workers, ex: Redis with SET NX for 'add'.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[StoredResponse]: ...
+
+    @abstractmethod
+    def add(self, key: str, entry: StoredResponse, ttl: float) -> bool:
+        """
+        Store an entry only if the key is free, atomically.
+
+        Args:
+            key (str): The scoped idempotency key.
+            entry (StoredResponse): The entry.
+            ttl (float): Time to live in seconds.
+
+        Returns:
+            bool: False if the key is already taken.
+        """
+
+    @abstractmethod
+    def set(self, key: str, entry: StoredResponse, ttl: float) -> None: ...
+
+    @abstractmethod
+    def delete(self, key: str) -> None: ...
+
+
+class MemoryIdempotencyBackend(IdempotencyBackend):
+    def __init__(self, maxsize: int):
+        """
+        Per-worker LRU backend. Retries must reach the same worker to be replayed.
+
+        Args:
+            maxsize (int): Max number of stored responses.
+        """
+
+        self.cache: LRUCache[StoredResponse] = LRUCache(maxsize=maxsize)
+        self._lock = Lock()
+
+    def get(self, key: str) -> Optional[StoredResponse]:
+        return self.cache.get(key)
+
+    def add(self, key: str, entry: StoredResponse, ttl: float) -> bool:
+        with self._lock:
+            if self.cache.get(key) is not None:
+                return False
+
+            self.cache.set(key, entry, expires_at=entry.created_at + ttl)
+            return True
+
+    def set(self, key: str, entry: StoredResponse, ttl: float) -> None:
+        self.cache.set(key, entry, expires_at=entry.created_at + ttl)
+
+    def delete(self, key: str) -> None:
+        self.cache.delete(key)
+
+
+idempotency_backend: IdempotencyBackend = MemoryIdempotencyBackend(
+    maxsize=project_settings.idempotency_max_keys
+)
+
+
+def set_idempotency_backend(backend: IdempotencyBackend) -> None:
+    """
+    Replace the process-wide idempotency backend, ex: with a shared one at startup.
+
+    Args:
+        backend (IdempotencyBackend): The new backend.
+    """
+
+    global idempotency_backend
+    idempotency_backend = backend
+
+
+async def idempotent_response(
+    request: Request,
+    user: UserDb,
+    idempotency_key: Optional[str],
+    payload: Any,
+    compute: Callable[[], Awaitable[Any]],
+) -> Response:
+    """
+    Run a write once per Idempotency-Key. Retries with the same key and payload are sent
+    the stored response of the first request instead of running the write again.
+    Failed requests aren't stored, so they can be retried with the same key.
+    A cancelled request (client gone) doesn't cancel its write, which is stored once done.
+
+    Args:
+        request (Request): The request.
+        user (UserDb): The authenticated user, keys are scoped per user and route.
+        idempotency_key (Optional[str]): The Idempotency-Key header. None runs the write as usual.
+        payload (Any): JSON-serializable request payload, ex: the dumped body schema.
+        compute (Callable[[], Awaitable[Any]]): Runs the write and returns the response content.
+        It may outlive the request, so it must not use the request db session or UploadFiles.
+
+    Returns:
+        Response: The JSON response.
+    """
+
+    if not project_settings.idempotency_enabled or idempotency_key is None:
+        return build_trusted_response(await compute())
+
+    key = f"{user.id}:{request.method}:{request.url.path}:{idempotency_key}"
+    fingerprint = hashlib.sha256(
+        orjson.dumps(payload, default=str, option=orjson.OPT_SORT_KEYS)
+    ).hexdigest()
+    ttl = project_settings.idempotency_ttl
+
+    entry = StoredResponse(fingerprint=fingerprint, created_at=time.time())
+    if not idempotency_backend.add(key, entry, ttl):
+        stored = idempotency_backend.get(key)
+        if stored is None:
+            # Expired meanwhile
+            return await idempotent_response(
+                request, user, idempotency_key, payload, compute
+            )
+
+        return replay(stored, fingerprint)
+
+    task = asyncio.ensure_future(compute())
+    try:
+        await asyncio.shield(task)
+    except asyncio.CancelledError:
+        if task.done():
+            settle(key, entry, task, ttl)
+        else:
+            # The write keeps running, ex: in the db executor, and may still commit.
+            # Its key stays taken until the outcome is stored, so a retry isn't run twice
+            task.add_done_callback(lambda done: settle(key, entry, done, ttl))
+        raise
+    except Exception:
+        pass
+
+    response = settle(key, entry, task, ttl)
+    if response is None:
+        # Raise the failure of the write
+        task.result()
+
+    return response
+
+
+def settle(
+    key: str, entry: StoredResponse, task: asyncio.Future, ttl: float
+) -> Optional[Response]:
+    """
+    Store the response of a finished write for its retries, or free its key if it failed.
+
+    Args:
+        key (str): The scoped idempotency key.
+        entry (StoredResponse): The in-flight entry taken for the key.
+        task (asyncio.Future): The finished write.
+        ttl (float): Time to live in seconds.
+
+    Returns:
+        Optional[Response]: The JSON response, None if the write failed.
+    """
+
+    if task.cancelled() or task.exception() is not None:
+        # Free the key for a retry
+        idempotency_backend.delete(key)
+        return None
+
+    try:
+        response = build_trusted_response(task.result())
+    except Exception:
+        idempotency_backend.delete(key)
+        raise
+
+    idempotency_backend.set(
+        key,
+        StoredResponse(
+            fingerprint=entry.fingerprint,
+            status_code=response.status_code,
+            body=response.body,
+            media_type=response.media_type,
+            created_at=entry.created_at,
+        ),
+        ttl,
+    )
+
+    return response
+
+
+def replay(stored: StoredResponse, fingerprint: str) -> Response:
+    """
+    Answer a retry with the stored response of its key.
+
+    Args:
+        stored (StoredResponse): The stored response.
+        fingerprint (str): Hash of the retry payload.
+
+    Returns:
+        Response: The stored response.
+    """
+
+    if stored.fingerprint != fingerprint:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} was already used for another request.",
+        )
+
+    if stored.status_code is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"A request with this {IDEMPOTENCY_KEY_HEADER} is still running, try again later.",
+            headers={"Retry-After": "1"},
+        )
+
+    return Response(
+        content=stored.body,
+        status_code=stored.status_code,
+        media_type=stored.media_type,
+        headers={"Idempotent-Replayed": "true"},
+    )
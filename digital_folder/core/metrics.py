@@ -0,0 +1,280 @@
+"""Prometheus metrics"""
+
+import asyncio
+import glob
+import logging
+import os
+import tempfile
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator
+
+import orjson
+
+from digital_folder.core.config import project_settings
+from digital_folder.core.timing import timed
+from digital_folder.helpers.metrics import (
+    Counter,
+    Gauge,
+    Histogram,
+    merge,
+    MetricsRegistry,
+    render,
+)
+
+logger = logging.getLogger(__name__)
+
+# Names the snapshot file of this worker, see 'metrics_dir'
+WORKER_ID = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+metrics = MetricsRegistry()
+
+# HTTP, see 'MetricsMiddleware'
+http_requests = metrics.register(
+    Counter(
+        "http_requests_total",
+        "Requests by route template and status.",
+        ("method", "route", "status"),
+    )
+)
+http_request_duration = metrics.register(
+    Histogram(
+        "http_request_duration_seconds",
+        "Request latency by route template.",
+        ("method", "route"),
+    )
+)
+http_requests_in_flight = metrics.register(
+    Gauge(
+        "http_requests_in_flight",
+        "Requests being served by router, ex: /projects.",
+        ("router",),
+    )
+)
+http_request_queries = metrics.register(
+    Histogram(
+        "http_request_db_queries",
+        "SQL statements run per request by route template.",
+        ("route",),
+        buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+    )
+)
+
+# Database, see 'TimedQueuePool'
+db_pool_checkout_wait = metrics.register(
+    Histogram(
+        "db_pool_checkout_wait_seconds",
+        "Time spent waiting for a pool connection.",
+        buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, 30),
+    )
+)
+db_pool_checkout_timeouts = metrics.register(
+    Counter(
+        "db_pool_checkout_timeouts_total",
+        "Checkouts that gave up waiting for a pool connection.",
+    )
+)
+db_pool_connections = metrics.register(
+    Gauge(
+        "db_pool_connections",
+        "Pool connections by state (size, checked_out, checked_in, overflow).",
+        ("state",),
+    )
+)
+executor_pending = metrics.register(
+    Gauge(
+        "executor_pending_calls",
+        "Calls running or waiting in a bounded executor.",
+        ("executor",),
+    )
+)
+
+# Supabase, see 'supabase_call'
+supabase_request_duration = metrics.register(
+    Histogram(
+        "supabase_request_duration_seconds",
+        "Supabase storage call latency by operation.",
+        ("operation",),
+    )
+)
+supabase_errors = metrics.register(
+    Counter(
+        "supabase_errors_total",
+        "Failed Supabase storage calls by operation.",
+        ("operation",),
+    )
+)
+
+# Caches
+cache_hits = metrics.register(
+    Counter("cache_hits_total", "Cache hits by cache.", ("cache",))
+)
+cache_misses = metrics.register(
+    Counter("cache_misses_total", "Cache misses by cache.", ("cache",))
+)
+cache_hit_ratio = metrics.register(
+    Gauge(
+        "cache_hit_ratio",
+        "Hits / (hits + misses) since the worker started.",
+        ("cache",),
+    )
+)
+cache_entries = metrics.register(
+    Gauge("cache_entries", "Entries held by cache.", ("cache",))
+)
+coalesced_requests = metrics.register(
+    Counter(
+        "coalesced_requests_total",
+        "Reads served by an identical read already running.",
+    )
+)
+
+
+@contextmanager
+def supabase_call(operation: str) -> Iterator[None]:
+    """
+    Time a Supabase storage call into its latency histogram and the request "storage" phase,
+    and count it if it fails.
+
+    Args:
+        operation (str): The storage operation, ex: "upload".
+    """
+
+    start = time.perf_counter()
+    try:
+        with timed("storage"):
+            yield
+    except Exception:
+        supabase_errors.inc(operation)
+        raise
+    finally:
+        supabase_request_duration.observe(time.perf_counter() - start, operation)
+
+
+def snapshot_path(worker: str) -> str:
+    return os.path.join(project_settings.metrics_dir, f"{worker}.json")
+
+
+def write_snapshot(live: bool = True) -> None:
+    """
+    Write the metrics of this worker to the metrics directory, for the other workers to serve.
+
+    Args:
+        live (bool): False when the worker stops, its gauges are dropped but its counters kept.
+    """
+
+    snapshot = {
+        "updated_at": time.time(),
+        "live": live,
+        "metrics": metrics.snapshot(),
+    }
+
+    # A temp file per write, scrapes and the flush task can write at the same time
+    file = tempfile.NamedTemporaryFile(
+        dir=project_settings.metrics_dir,
+        prefix=f"{WORKER_ID}.",
+        suffix=".tmp",
+        delete=False,
+    )
+    try:
+        with file:
+            file.write(orjson.dumps(snapshot))
+        os.replace(file.name, snapshot_path(WORKER_ID))
+    except OSError:
+        os.unlink(file.name)
+        raise
+
+
+def read_snapshots() -> list[dict[str, dict[str, Any]]]:
+    """
+    Read the metrics of every worker, live or stopped, from the metrics directory.
+    Counters and histograms of stopped workers are kept, so totals never go backwards.
+    Gauges are only kept for live workers, labelled with the worker.
+
+    Returns:
+        list[dict[str, dict[str, Any]]]: Metric name -> family, per worker.
+    """
+
+    stale_after = 3 * project_settings.metrics_flush_interval
+    snapshots = []
+    for path in glob.glob(snapshot_path("*")):
+        try:
+            with open(path, "rb") as file:
+                snapshot = orjson.loads(file.read())
+        except (OSError, orjson.JSONDecodeError):
+            continue
+
+        live = snapshot["live"] and time.time() - snapshot["updated_at"] < stale_after
+        worker = os.path.basename(path).removesuffix(".json")
+
+        families = {}
+        for name, family in snapshot["metrics"].items():
+            if family["type"] == "gauge":
+                if not live:
+                    continue
+                family = {
+                    **family,
+                    "labelnames": [*family["labelnames"], "worker"],
+                    "samples": [
+                        [[*labels, worker], value]
+                        for labels, value in family["samples"]
+                    ],
+                }
+            families[name] = family
+
+        snapshots.append(families)
+
+    return snapshots
+
+
+def scrape(collect: Callable[[], None]) -> str:
+    """
+    Render the metrics of this worker or, with a metrics directory, of every worker.
+    Falls back to this worker only if the metrics directory can't be used.
+
+    Args:
+        collect (Callable[[], None]): Refreshes the metrics read from elsewhere, ex: pool and cache stats.
+
+    Returns:
+        str: The Prometheus text exposition.
+    """
+
+    collect()
+    if not project_settings.metrics_dir:
+        return render(metrics.snapshot())
+
+    try:
+        write_snapshot()
+        return render(merge(read_snapshots()))
+    except OSError as exc:
+        logger.warning("Metrics snapshot failed: %r", exc)
+        return render(metrics.snapshot())
+
+
+async def flush_snapshots(collect: Callable[[], None]) -> None:
+    """
+    Write the metrics of this worker to the metrics directory until cancelled,
+    so a scrape served by any worker includes them.
+
+    Args:
+        collect (Callable[[], None]): Refreshes the metrics read from elsewhere.
+    """
+
+    try:
+        while True:
+            try:
+                collect()
+                write_snapshot()
+            except OSError as exc:
+                logger.warning("Metrics snapshot failed: %r", exc)
+
+            await asyncio.sleep(project_settings.metrics_flush_interval)
+    finally:
+        try:
+            collect()
+            write_snapshot(live=False)
+        except OSError:
+            pass
@@ -0,0 +1,177 @@
+import asyncio
+from typing import Optional
+from uuid import UUID
+
+from jose import JWTError
+from starlette.datastructures import Headers
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from digital_folder.packages.AccessToken.dto import decode_access_token
+from digital_folder.packages.User.cache import cached_role
+
+
+class ConcurrencyLimit:
+    def __init__(self, name: str, limit: int, max_queue: int, queue_timeout: float):
+        """
+        Max number of requests running at the same time, with a bounded waiting queue.
+        Only used from the event loop thread, so no lock is needed.
+
+        Args:
+            name (str): Name used in error messages, ex: "/projects".
+            limit (int): Max number of requests running at the same time.
+            max_queue (int): Max number of requests waiting for a slot before failing fast.
+            queue_timeout (float): Max seconds a request waits for a slot.
+        """
+
+        self.name = name
+        self.limit = limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.active = 0
+        self.waiting = 0
+        self.semaphore = asyncio.Semaphore(limit)
+
+    async def acquire(self) -> bool:
+        """
+        Take a slot, waiting in the queue if needed.
+
+        Returns:
+            bool: False if the queue is full or the wait timed out.
+        """
+
+        if not self.semaphore.locked():
+            # Free slot, taken without suspending
+            await self.semaphore.acquire()
+        elif self.waiting >= self.max_queue:
+            return False
+        else:
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self.semaphore.acquire(), self.queue_timeout)
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                self.waiting -= 1
+
+        self.active += 1
+        return True
+
+    def release(self) -> None:
+        self.active -= 1
+        self.semaphore.release()
+
+
+class AdmissionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        prefix: str,
+        route_limits: dict[str, int],
+        role_limits: dict[str, int],
+        max_queue: int,
+        queue_timeout: float,
+        exempt_routes: Optional[list[str]] = None,
+    ):
+        """
+        Limit concurrent requests per route prefix and per user role, so a burst on one
+        route or from one role can't take every db connection. Requests over a limit wait
+        in a bounded queue, then fail fast with 503 and Retry-After.
+
+        The role comes from the access token claims ("full" claims mode) or from the roles of
+        the users this worker already authenticated, never from the database.
+        Requests with an unknown role are only limited by route.
+
+        Args:
+            app (ASGIApp): The wrapped ASGI app.
+            prefix (str): Prefix the api router is mounted on, ex: "/api".
+            route_limits (dict[str, int]): Route prefix (after 'prefix') -> limit, the longest match wins. 0 = unlimited.
+            role_limits (dict[str, int]): User role -> limit. 0 = unlimited.
+            max_queue (int): Max number of requests waiting per limit.
+            queue_timeout (float): Max seconds a request waits for a slot.
+            exempt_routes (Optional[list[str]]): Route prefixes (after 'prefix') never limited,
+            ex: long-lived streams that would hold a slot until the client leaves.
+        """
+
+        self.app = app
+        self.prefix = prefix
+        self.route_limits = {
+            route: ConcurrencyLimit(route, limit, max_queue, queue_timeout)
+            for route, limit in route_limits.items()
+            if limit > 0
+        }
+        self.exempt_routes = exempt_routes or []
+        # Longest prefixes first, ex: /users/login before /users
+        self.routes = sorted(self.route_limits, key=len, reverse=True)
+        self.role_limits = {
+            role: ConcurrencyLimit(role, limit, max_queue, queue_timeout)
+            for role, limit in role_limits.items()
+            if limit > 0
+        }
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if (
+            scope["type"] != "http"
+            or not scope["path"].startswith(self.prefix)
+            or self.exempt(scope)
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        limits = [
+            limit
+            for limit in (self.route_limit(scope), self.role_limit(scope))
+            if limit is not None
+        ]
+
+        acquired = []
+        try:
+            for limit in limits:
+                if not await limit.acquire():
+                    response = JSONResponse(
+                        {"detail": f"Server is busy ({limit.name}), try again later."},
+                        status_code=503,
+                        headers={"Retry-After": "1"},
+                    )
+                    await response(scope, receive, send)
+                    return
+
+                acquired.append(limit)
+
+            await self.app(scope, receive, send)
+        finally:
+            for limit in acquired:
+                limit.release()
+
+    def exempt(self, scope: Scope) -> bool:
+        path = scope["path"][len(self.prefix) :]
+        return any(matches(path, route) for route in self.exempt_routes)
+
+    def route_limit(self, scope: Scope) -> Optional[ConcurrencyLimit]:
+        path = scope["path"][len(self.prefix) :]
+        for route in self.routes:
+            if matches(path, route):
+                return self.route_limits[route]
+
+        return None
+
+    def role_limit(self, scope: Scope) -> Optional[ConcurrencyLimit]:
+        if not self.role_limits:
+            return None
+
+        scheme, _, token = Headers(scope=scope).get("authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not token:
+            return None
+
+        try:
+            payload = decode_access_token(token)
+            role = payload.get("role") or cached_role(UUID(payload.get("id")))
+        except (JWTError, TypeError, ValueError):
+            # Invalid tokens are rejected by 'validate_user'
+            return None
+
+        return self.role_limits.get(role) if role else None
+
+
+def matches(path: str, route: str) -> bool:
+    return path == route or path.startswith(route.rstrip("/") + "/")
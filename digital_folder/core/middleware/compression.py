@@ -0,0 +1,165 @@
+import gzip
+from typing import List, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+def pick_encoding(accept_encoding: str, allow_brotli: bool) -> Optional[str]:
+    """
+    Choose the response encoding from the client's Accept-Encoding header.
+
+    Args:
+        accept_encoding (str): The Accept-Encoding header value.
+        allow_brotli (bool): Flag to allow brotli, when the 'brotli' package is installed.
+
+    Returns:
+        Optional[str]: "br", "gzip" or None if the client accepts neither.
+    """
+
+    accepted = set()
+    for value in accept_encoding.lower().split(","):
+        encoding, _, params = value.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0"):
+            accepted.add(encoding)
+
+    if allow_brotli and brotli is not None and "br" in accepted:
+        return "br"
+    if "gzip" in accepted:
+        return "gzip"
+
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int,
+        content_types: List[str],
+        level: int = 6,
+        allow_brotli: bool = False,
+    ):
+        """
+        Compress complete (non streaming) responses with gzip or brotli.
+
+        Args:
+            app (ASGIApp): The wrapped ASGI app.
+            minimum_size (int): Bodies smaller than this, in bytes, are sent as is.
+            content_types (List[str]): Media types allowed to be compressed, ex: application/json.
+            level (int): gzip compression level (1-9), brotli uses its own fast default.
+            allow_brotli (bool): Flag to prefer brotli when the client accepts it.
+        """
+
+        self.app = app
+        self.minimum_size = minimum_size
+        self.content_types = content_types
+        self.level = level
+        self.allow_brotli = allow_brotli
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = pick_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), self.allow_brotli
+        )
+        if not encoding:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Message = {}
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message
+
+            if message["type"] == "http.response.start":
+                # Hold the headers until the body tells us if it can be compressed
+                start_message = message
+                return
+
+            if message["type"] != "http.response.body" or not start_message:
+                await send(message)
+                return
+
+            initial_message, start_message = start_message, {}
+            body = message.get("body", b"")
+            if self.should_compress(initial_message, body, message):
+                body = self.compress(body, encoding)
+
+                headers = MutableHeaders(raw=initial_message["headers"])
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                weaken_etag(headers)
+                message["body"] = body
+            elif initial_message["status"] == 304:
+                # Sends the validator the compressed 200 would have
+                weaken_etag(MutableHeaders(raw=initial_message["headers"]))
+
+            await send(initial_message)
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
+
+    def should_compress(self, start: Message, body: bytes, message: Message) -> bool:
+        """
+        Check if a response qualifies for compression.
+        Streaming bodies (ex: server-sent events) are never compressed.
+
+        Args:
+            start (Message): The http.response.start message.
+            body (bytes): The first body chunk.
+            message (Message): The first http.response.body message.
+
+        Returns:
+            bool: True if the body should be compressed.
+        """
+
+        if message.get("more_body", False) or len(body) < self.minimum_size:
+            return False
+
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers:
+            return False
+
+        content_type = headers.get("content-type", "").split(";")[0].strip()
+
+        return content_type in self.content_types
+
+    def compress(self, body: bytes, encoding: str) -> bytes:
+        """
+        Compress a body with the chosen encoding.
+
+        Args:
+            body (bytes): The raw body.
+            encoding (str): "br" or "gzip".
+
+        Returns:
+            bytes: The compressed body.
+        """
+
+        if encoding == "br":
+            return brotli.compress(body, quality=4)
+
+        return gzip.compress(body, compresslevel=self.level)
+
+
+def weaken_etag(headers: MutableHeaders) -> None:
+    """
+    Content-codings of a resource can't share a strong validator, so a compressed body
+    gets a weak ETag. If-None-Match still matches it (weak comparison, see 'check_etag').
+
+    Args:
+        headers (MutableHeaders): The response headers.
+    """
+
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
@@ -0,0 +1,72 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from digital_folder.core.metrics import (
+    http_request_duration,
+    http_request_queries,
+    http_requests,
+    http_requests_in_flight,
+)
+from digital_folder.core.timing import request_timings, RequestTimings
+
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, prefix: str):
+        """
+        Count requests, their latency and SQL statements per route template,
+        and the requests in flight per router.
+        Statements are counted from the request timings, see 'instrument_engine'.
+
+        Args:
+            app (ASGIApp): The wrapped ASGI app.
+            prefix (str): Prefix the api router is mounted on, ex: "/api".
+        """
+
+        self.app = app
+        self.prefix = prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        # Shared with ServerTimingMiddleware when both are enabled
+        timings = request_timings.get()
+        token = None
+        if timings is None:
+            timings = RequestTimings()
+            token = request_timings.set(timings)
+
+        router = self.router(scope)
+        http_requests_in_flight.inc(router)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_status(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            http_requests_in_flight.dec(router)
+            if token is not None:
+                request_timings.reset(token)
+
+            # Templates keep the label values bounded, unknown paths share one
+            route = getattr(scope.get("route"), "path_format", "unmatched")
+            method = scope["method"]
+            http_requests.inc(method, route, str(status))
+            http_request_duration.observe(time.perf_counter() - start, method, route)
+            http_request_queries.observe(timings.phases.get("sql", (0, 0))[1], route)
+
+    def router(self, scope: Scope) -> str:
+        path = scope["path"]
+        if not path.startswith(self.prefix):
+            return "other"
+
+        return "/" + path[len(self.prefix) :].strip("/").split("/", 1)[0]
@@ -0,0 +1,62 @@
+import logging
+
+import orjson
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from digital_folder.core.timing import request_timings, RequestTimings
+
+logger = logging.getLogger(__name__)
+
+
+class ServerTimingMiddleware:
+    def __init__(self, app: ASGIApp, header: bool = True):
+        """
+        Collect the phase timings of every request, see 'timed', then send them
+        in a Server-Timing header and log them as one JSON line once the response is sent.
+
+        Args:
+            app (ASGIApp): The wrapped ASGI app.
+            header (bool): Send the Server-Timing header, the log line is always written.
+        """
+
+        self.app = app
+        self.header = header
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = request_timings.set(timings)
+        status = 500
+
+        async def send_with_timings(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.header:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.server_timing())
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timings)
+        finally:
+            request_timings.reset(token)
+            route = scope.get("route")
+            logger.info(
+                orjson.dumps(
+                    {
+                        "method": scope["method"],
+                        "path": scope["path"],
+                        # Path template, ex: /api/projects/project/{project_id}
+                        "route": getattr(route, "path_format", None),
+                        "status": status,
+                        "ms": round(timings.elapsed() * 1000, 2),
+                        "phases": timings.summary(),
+                    }
+                ).decode()
+            )
@@ -1,15 +1,16 @@
-from typing import Any, List, Literal, Optional, Union
+from typing import Any, Callable, Generic, List, Literal, Optional, TypeVar
 
 from pydantic import BaseModel
 
-from digital_folder.packages.Group.schemas import GroupOut
-from digital_folder.packages.Project.schemas import ProjectOut
-from digital_folder.packages.Tag.schemas import TagOut
-from digital_folder.packages.Ticket.schemas import TicketOut
+ItemType = TypeVar("ItemType")
 
 
-class PaginatedResponse(BaseModel):
-    items: List[Union[GroupOut, ProjectOut, TagOut, TicketOut]]
+class PaginatedResponse(BaseModel, Generic[ItemType]):
+    """
+    Paginated list of a single item type, ex: PaginatedResponse[TagOut].
+    """
+
+    items: List[ItemType]
     count: int
 
 
@@ -18,6 +19,46 @@ class SortParam(BaseModel):
     order: Literal["asc", "desc"] = "asc"
 
 
+class Fieldset(BaseModel):
+    """
+    Sparse fieldset: which fields to return and which relations to expand. None means all.
+    """
+
+    fields: Optional[List[str]] = None
+    include: Optional[List[str]] = None
+
+    def selects_all(self) -> bool:
+        return self.fields is None and self.include is None
+
+    def has_field(self, field: str) -> bool:
+        return field == "id" or self.fields is None or field in self.fields
+
+    def includes(self, relation: str) -> bool:
+        return self.include is None or relation in self.include
+
+    def pick(
+        self, values: dict[str, Callable[[], Any]], relations: dict[str, str]
+    ) -> dict[str, Any]:
+        """
+        Resolve only the requested values, so unrequested columns and relations are never loaded.
+
+        Args:
+            values (dict[str, Callable[[], Any]]): Output field -> callable returning its value.
+            relations (dict[str, str]): Output field -> relation it comes from, ex: {"tag_ids": "tags"}.
+
+        Returns:
+            dict[str, Any]: The requested output fields and their values.
+        """
+
+        picked = {}
+        for field, value in values.items():
+            relation = relations.get(field)
+            if self.includes(relation) if relation else self.has_field(field):
+                picked[field] = value()
+
+        return picked
+
+
 class QueryParams(BaseModel):
     """
     Universal query params schema for filtering, searching and sorting.
@@ -28,3 +69,4 @@ class QueryParams(BaseModel):
     page: int = 1
     search: Optional[str] = None
     sort_by: Optional[List[SortParam]] = None
+    fieldset: Fieldset = Fieldset()
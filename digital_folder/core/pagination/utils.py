@@ -1,8 +1,7 @@
 import json
 from typing import Optional
 
-from digital_folder.core.pagination.types import QueryParams, SortParam
-from digital_folder.db.models import User
+from digital_folder.core.pagination.types import Fieldset, QueryParams, SortParam
 from digital_folder.db.service import DbService
 from digital_folder.packages.User.schemas import UserRole
 
@@ -14,9 +13,12 @@ def query_params_parser(
     page: int = 1,
     search: Optional[str] = None,
     sort_by: Optional[str] = None,
+    fields: Optional[str] = None,
+    include: Optional[str] = None,
 ) -> QueryParams:
     """
     This function takes data for filtering, searching and sorting and turns it into a QueryParams object.
+    'created_by' roles are resolved to user IDs from the process-wide role cache.
 
     Args:
         db (DbService): The db session.
@@ -25,6 +27,8 @@ def query_params_parser(
         page (int): Page to return items from.
         search (Optional[str]): Search string.
         sort_by (Optional[str]): JSON string like '[{"key":"name","order":"desc"}]'.
+        fields (Optional[str]): Comma-separated fields to return.
+        include (Optional[str]): Comma-separated relations to expand.
 
     Returns:
         QueryParams: The parsed query data.
@@ -43,8 +47,7 @@ def query_params_parser(
                 created_by_role.append(UserRole.VIEWER.value)
 
             parsed_filters["created_by"] = [
-                user_dto.get_by_field(User.role, UserRole(role)).id
-                for role in created_by_role
+                user_dto.get_id_by_role(UserRole(role)) for role in created_by_role
             ]
 
     parsed_sort_by = []
@@ -59,4 +62,34 @@ def query_params_parser(
         page=page,
         items_per_page=items_per_page,
         sort_by=parsed_sort_by,
+        fieldset=fieldset_parser(fields, include),
+    )
+
+
+def fieldset_parser(
+    fields: Optional[str] = None, include: Optional[str] = None
+) -> Fieldset:
+    """
+    This function takes the comma-separated 'fields' and 'include' query params and turns them into a Fieldset.
+    A missing param selects everything, an empty one selects nothing (besides the id).
+
+    Args:
+        fields (Optional[str]): Comma-separated fields to return, ex: "name,images".
+        include (Optional[str]): Comma-separated relations to expand, ex: "tags,urls,group".
+
+    Returns:
+        Fieldset: The parsed fieldset.
+    """
+
+    return Fieldset(
+        fields=(
+            [field.strip() for field in fields.split(",") if field.strip()]
+            if fields is not None
+            else None
+        ),
+        include=(
+            [relation.strip() for relation in include.split(",") if relation.strip()]
+            if include is not None
+            else None
+        ),
     )
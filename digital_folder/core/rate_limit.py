@@ -0,0 +1,171 @@
+"""Rate limiting"""
+
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Literal
+
+from fastapi import Depends, HTTPException, Request, status
+from pydantic import BaseModel
+
+from digital_folder.core.config import project_settings
+from digital_folder.core.dependencies import validate_user
+from digital_folder.core.responses import add_response_headers
+from digital_folder.packages.User.schemas import UserDb
+
+
+class RateLimitState(BaseModel):
+    """Rate Limit State schema"""
+
+    allowed: bool
+    limit: int
+    remaining: int
+    # Seconds until the bucket is full again
+    reset: float
+    # Seconds until the next token, 0 if allowed
+    retry_after: float
+
+    def headers(self) -> dict[str, str]:
+        headers = {
+            "X-RateLimit-Limit": str(self.limit),
+            "X-RateLimit-Remaining": str(self.remaining),
+            "X-RateLimit-Reset": str(math.ceil(self.reset)),
+        }
+        if not self.allowed:
+            headers["Retry-After"] = str(math.ceil(self.retry_after))
+
+        return headers
+
+
+class RateLimitBackend(ABC):
+    """
+    Token bucket storage. Subclass it to share the buckets between workers,
+    ex: Redis with the same math in a Lua script.
+    """
+
+    @abstractmethod
+    def take(self, key: str, rate: float, capacity: int) -> RateLimitState:
+        """
+        Take a token from a bucket, refilled continuously.
+
+        Args:
+            key (str): The bucket key, ex: "tickets:user:{id}".
+            rate (float): Tokens added per second.
+            capacity (int): Max tokens in the bucket, the allowed burst.
+
+        Returns:
+            RateLimitState: Whether the token was taken and the bucket state.
+        """
+
+
+class MemoryRateLimitBackend(RateLimitBackend):
+    def __init__(self, maxsize: int):
+        """
+        Per-worker token buckets. The least recently used buckets are dropped past 'maxsize',
+        they come back full.
+
+        Args:
+            maxsize (int): Max number of buckets.
+        """
+
+        self.maxsize = maxsize
+        self._buckets: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = Lock()
+
+    def take(self, key: str, rate: float, capacity: int) -> RateLimitState:
+        now = time.monotonic()
+
+        with self._lock:
+            tokens, updated_at = self._buckets.get(key, (capacity, now))
+            tokens = min(capacity, tokens + (now - updated_at) * rate)
+
+            allowed = tokens >= 1
+            if allowed:
+                tokens -= 1
+
+            self._buckets[key] = (tokens, now)
+            self._buckets.move_to_end(key)
+            while len(self._buckets) > self.maxsize:
+                self._buckets.popitem(last=False)
+
+        return RateLimitState(
+            allowed=allowed,
+            limit=capacity,
+            remaining=int(tokens),
+            reset=(capacity - tokens) / rate,
+            retry_after=0 if allowed else (1 - tokens) / rate,
+        )
+
+
+rate_limit_backend: RateLimitBackend = MemoryRateLimitBackend(
+    maxsize=project_settings.rate_limit_max_keys
+)
+
+
+def set_rate_limit_backend(backend: RateLimitBackend) -> None:
+    """
+    Replace the process-wide rate limit backend, ex: with a shared one at startup.
+
+    Args:
+        backend (RateLimitBackend): The new backend.
+    """
+
+    global rate_limit_backend
+    rate_limit_backend = backend
+
+
+def check_rate_limit(request: Request, router: str, key: str) -> None:
+    """
+    Take a token from the router bucket of a client, then add the rate limit headers
+    to the response or answer 429 Too Many Requests.
+
+    Args:
+        request (Request): The request.
+        router (str): The router name, ex: "tickets".
+        key (str): What identifies the client, ex: "user:{id}".
+    """
+
+    limits = project_settings.rate_limits.get(router)
+    if not project_settings.rate_limit_enabled or not limits:
+        return
+
+    per_minute, burst = limits
+    state = rate_limit_backend.take(f"{router}:{key}", per_minute / 60, burst)
+    if not state.allowed:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests, try again later.",
+            headers=state.headers(),
+        )
+
+    add_response_headers(request, state.headers())
+
+
+def rate_limit(router: str, by: Literal["user", "ip"] = "user") -> Callable:
+    """
+    Build the rate limit dependency of a router.
+
+    Args:
+        router (str): The router name, the key of its limits in the project settings.
+        by (Literal["user", "ip"]): Key the buckets by authenticated user or by client IP (routes without a user).
+
+    Returns:
+        Callable: The dependency.
+    """
+
+    if by == "ip":
+
+        def rate_limit_by_ip(request: Request) -> None:
+            client = request.client.host if request.client else "unknown"
+            check_rate_limit(request, router, f"ip:{client}")
+
+        return rate_limit_by_ip
+
+    def rate_limit_by_user(
+        request: Request, user: UserDb = Depends(validate_user)
+    ) -> None:
+        check_rate_limit(request, router, f"user:{user.id}")
+
+    return rate_limit_by_user
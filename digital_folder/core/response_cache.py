@@ -0,0 +1,367 @@
+"""Server-side response cache"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import TYPE_CHECKING, Any, Callable, Iterable, Optional
+
+import orjson
+from fastapi import Request
+from fastapi.responses import Response
+from pydantic import BaseModel
+
+from digital_folder.core.config import project_settings
+from digital_folder.core.responses import build_trusted_response
+from digital_folder.db.db import db_executor
+from digital_folder.helpers.cache import CacheStats, LRUCache
+from digital_folder.helpers.singleflight import SingleFlight
+from digital_folder.packages.User.schemas import UserDb, UserRole
+
+if TYPE_CHECKING:
+    from digital_folder.db.service import DbService
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse(BaseModel):
+    """Cached Response schema"""
+
+    body: bytes
+    # Versions of the collections the body was built from
+    versions: list[int]
+    created_at: float
+
+    def age(self) -> float:
+        return time.time() - self.created_at
+
+
+class CachePolicy(BaseModel):
+    """
+    Stale-while-revalidate windows (seconds) of a router for viewer reads.
+    Entries younger than 'fresh' built from the current versions are served as is,
+    entries younger than 'fresh' + 'max_stale' are served while one task refreshes them.
+    """
+
+    fresh: float
+    max_stale: float
+
+
+class ResponseCacheBackend(ABC):
+    """
+    Storage for serialized read responses.
+    Entries remember the versions of the collections they were built from, so a write
+    only has to move those versions forward for every dependent entry to become outdated.
+    Subclass it to share the cache between workers, ex: Redis with INCR'ed version keys.
+    """
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[CachedResponse]: ...
+
+    @abstractmethod
+    def set(self, key: str, entry: CachedResponse, ttl: float) -> None: ...
+
+    @abstractmethod
+    def versions(self, db: "DbService", collections: Iterable[str]) -> list[int]:
+        """
+        Current versions of the collections a response is built from.
+
+        Args:
+            db (DbService): The db session, holding the in-process collection versions.
+            collections (Iterable[str]): The collections (tables) the response is built from.
+
+        Returns:
+            list[int]: The versions, in the collections order.
+        """
+
+    @abstractmethod
+    def invalidate(self, collection: str) -> None:
+        """
+        Called by DbService after every committed write to a collection.
+
+        Args:
+            collection (str): The collection (table) name.
+        """
+
+    def stats(self) -> Optional[CacheStats]:
+        return None
+
+
+class MemoryResponseCache(ResponseCacheBackend):
+    def __init__(self, maxsize: int):
+        """
+        Per-worker LRU backend compared against the in-process collection versions,
+        which DbService already bumps on every write.
+
+        Args:
+            maxsize (int): Maximum number of cached responses. 0 disables the cache.
+        """
+
+        self.cache: LRUCache[CachedResponse] = LRUCache(maxsize=maxsize)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        return self.cache.get(key)
+
+    def set(self, key: str, entry: CachedResponse, ttl: float) -> None:
+        self.cache.set(key, entry, expires_at=entry.created_at + ttl)
+
+    def versions(self, db: "DbService", collections: Iterable[str]) -> list[int]:
+        return [db.versions.get(collection, 0) for collection in collections]
+
+    def invalidate(self, collection: str) -> None:
+        # Entries are checked against the versions DbService just bumped
+        pass
+
+    def stats(self) -> Optional[CacheStats]:
+        return self.cache.stats()
+
+
+response_cache: ResponseCacheBackend = MemoryResponseCache(
+    maxsize=(
+        project_settings.response_cache_size
+        if project_settings.response_cache_enabled
+        else 0
+    ),
+)
+
+# Identical reads running at the same time (same key) share one computation
+request_coalescer: SingleFlight[bytes] = SingleFlight()
+
+# Strong references to the running background refreshes
+refresh_tasks: set[asyncio.Task] = set()
+
+
+def set_response_cache_backend(backend: ResponseCacheBackend) -> None:
+    """
+    Replace the process-wide response cache backend, ex: with a shared one at startup.
+
+    Args:
+        backend (ResponseCacheBackend): The new backend.
+    """
+
+    global response_cache
+    response_cache = backend
+
+
+def get_cache_policy(router: str) -> Optional[CachePolicy]:
+    """
+    Get the stale-while-revalidate windows of a router from the project settings.
+
+    Args:
+        router (str): The router name, ex: "projects".
+
+    Returns:
+        Optional[CachePolicy]: The windows, or None if viewer reads of the router are never served stale.
+    """
+
+    windows = project_settings.stale_while_revalidate.get(router)
+    if not windows:
+        return None
+
+    fresh, max_stale = windows
+    return CachePolicy(fresh=fresh, max_stale=max_stale)
+
+
+def response_cache_key(
+    request: Request, db: "DbService", params: Optional[BaseModel] = None
+) -> str:
+    """
+    Build the cache key of a read response from the endpoint,
+    the user scope and the normalized query params.
+
+    Args:
+        request (Request): The request.
+        db (DbService): The db session, holding the user.
+        params (Optional[BaseModel]): The parsed query params, ex: QueryParams or Fieldset.
+
+    Returns:
+        str: The cache key.
+    """
+
+    raw = orjson.dumps(
+        [
+            request.url.path,
+            db.user.filter_id,
+            params.model_dump(mode="json") if params is not None else None,
+        ],
+        default=str,
+        option=orjson.OPT_SORT_KEYS,
+    )
+
+    return hashlib.sha256(raw).hexdigest()
+
+
+async def cached_response(
+    request: Request,
+    db: "DbService",
+    collections: Iterable[str],
+    params: Optional[BaseModel],
+    compute: Callable[["DbService"], Any],
+    policy: Optional[CachePolicy] = None,
+) -> Response:
+    """
+    Serve a read response from the response cache, or compute, serialize and cache it.
+    On a miss, concurrent identical requests await a single computation,
+    which runs in the db executor so the event loop keeps serving them.
+    With a policy, viewers are served outdated entries within the policy windows
+    while a single background task refreshes them.
+
+    Args:
+        request (Request): The request.
+        db (DbService): The db session, holding the user.
+        collections (Iterable[str]): The collections (tables) the response is built from.
+        params (Optional[BaseModel]): The parsed query params, ex: QueryParams or Fieldset.
+        compute (Callable[[DbService], Any]): Builds the response content with a db session, ex: the DTO list call.
+        policy (Optional[CachePolicy]): The router stale-while-revalidate windows.
+
+    Returns:
+        Response: The JSON response.
+    """
+
+    collections = list(collections)
+    key = response_cache_key(request, db, params)
+    versions = response_cache.versions(db, collections)
+    if policy is None or db.user.role != UserRole.VIEWER:
+        policy = None
+        ttl = project_settings.response_cache_ttl
+    else:
+        ttl = policy.fresh + policy.max_stale
+
+    entry = response_cache.get(key)
+    if entry is not None:
+        if entry.versions == versions and entry.age() < (
+            policy.fresh if policy else ttl
+        ):
+            return json_response(entry.body)
+
+        if policy and entry.age() < ttl:
+            refresh_in_background(key, db.user, collections, compute, ttl)
+            # The ETag describes the current versions, not this body
+            getattr(request.state, "response_headers", {}).pop("ETag", None)
+
+            return json_response(entry.body)
+
+    if project_settings.request_coalescing_enabled:
+        # The shared computation can outlive this request, so it opens its own session
+        body = await request_coalescer.run(
+            (key, tuple(versions)),
+            lambda: db_executor.run(
+                render_detached, key, db.user, collections, compute, ttl
+            ),
+        )
+    else:
+        body = await db_executor.run(render_entry, key, db, collections, compute, ttl)
+
+    return json_response(body)
+
+
+def render_entry(
+    key: str,
+    db: "DbService",
+    collections: list[str],
+    compute: Callable[["DbService"], Any],
+    ttl: float,
+) -> bytes:
+    """
+    Compute and serialize a read response, then cache it. Blocking, runs in the db executor.
+
+    Args:
+        key (str): The cache key.
+        db (DbService): The db session used to compute the response.
+        collections (list[str]): The collections (tables) the response is built from.
+        compute (Callable[[DbService], Any]): Builds the response content with a db session.
+        ttl (float): Time to live in seconds of the cache entry.
+
+    Returns:
+        bytes: The serialized response.
+    """
+
+    # Read before the queries, so the entry is never newer than its versions
+    versions = response_cache.versions(db, collections)
+    created_at = time.time()
+
+    # Batch sub-requests share one session
+    with db.lock:
+        content = compute(db)
+    body = build_trusted_response(content).body
+    response_cache.set(
+        key, CachedResponse(body=body, versions=versions, created_at=created_at), ttl
+    )
+
+    return body
+
+
+def render_detached(
+    key: str,
+    user: UserDb,
+    collections: list[str],
+    compute: Callable[["DbService"], Any],
+    ttl: float,
+) -> bytes:
+    """
+    Compute and cache a read response with its own db session, for work that may outlive
+    the request that started it: coalesced reads and background refreshes.
+    Blocking, runs in the db executor.
+
+    Args:
+        key (str): The cache key.
+        user (UserDb): The user whose scope the response is built for.
+        collections (list[str]): The collections (tables) the response is built from.
+        compute (Callable[[DbService], Any]): Builds the response content with a db session.
+        ttl (float): Time to live in seconds of the cache entry.
+
+    Returns:
+        bytes: The serialized response.
+    """
+
+    # Imported here, DbService itself imports this module to invalidate the cache
+    from digital_folder.db.service import DbService
+
+    with DbService(user) as db:
+        return render_entry(key, db, collections, compute, ttl)
+
+
+def refresh_in_background(
+    key: str,
+    user: UserDb,
+    collections: list[str],
+    compute: Callable[["DbService"], Any],
+    ttl: float,
+) -> None:
+    """
+    Recompute a cache entry outside of the request, at most once at a time per key.
+    The request session is closed with the response, the refresh opens its own.
+
+    Args:
+        key (str): The cache key.
+        user (UserDb): The user whose scope the response is built for.
+        collections (list[str]): The collections (tables) the response is built from.
+        compute (Callable[[DbService], Any]): Builds the response content with a db session.
+        ttl (float): Time to live in seconds of the cache entry.
+    """
+
+    if (key, "refresh") in request_coalescer.calls:
+        return
+
+    task = asyncio.create_task(
+        request_coalescer.run(
+            (key, "refresh"),
+            lambda: db_executor.run(
+                render_detached, key, user, collections, compute, ttl
+            ),
+        )
+    )
+    refresh_tasks.add(task)
+    task.add_done_callback(refresh_done)
+
+
+def refresh_done(task: asyncio.Task) -> None:
+    refresh_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        # The stale entry is kept, the next viewer read tries again
+        logger.warning("Response cache refresh failed: %r", task.exception())
+
+
+def json_response(body: bytes) -> Response:
+    return Response(content=body, media_type="application/json")
@@ -0,0 +1,182 @@
+"""Response helpers"""
+
+import functools
+from typing import Any, Callable, Coroutine, Optional, Type
+
+import orjson
+from fastapi import Request
+from fastapi.datastructures import DefaultPlaceholder
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+from fastapi.routing import APIRoute
+from pydantic import BaseModel
+
+from digital_folder.core.config import project_settings
+from digital_folder.core.timing import current_route, timed
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with orjson, which handles UUID, datetime and enums natively.
+    Pydantic models can be passed as content directly, skipping 'jsonable_encoder'.
+    """
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, BaseModel):
+            content = dump_trusted(content)
+
+        # 'default=str' covers the few types orjson doesn't know, ex: pydantic HttpUrl
+        return orjson.dumps(content, default=str, option=orjson.OPT_NON_STR_KEYS)
+
+
+def dump_trusted(content: BaseModel, mode: str = "python") -> dict[str, Any]:
+    """
+    Dump a response object built by the DTO parsers.
+
+    Fields the parsers left unset (sparse fieldsets) are omitted, and nested objects are
+    dumped by their actual schema, ex: TagWithoutGroupOut inside ProjectOut.tags.
+
+    Args:
+        content (BaseModel): The response object.
+        mode (str): Pydantic dump mode, "python" or "json".
+
+    Returns:
+        dict[str, Any]: The dumped response.
+    """
+
+    return content.model_dump(mode=mode, exclude_unset=True, serialize_as_any=True)
+
+
+def build_trusted_response(
+    content: Any,
+    response_class: Optional[Type[JSONResponse]] = None,
+    status_code: int = 200,
+) -> Response:
+    """
+    Build the response of an already-built response schema.
+
+    Args:
+        content (Any): The response content, usually a response schema built by a DTO parser.
+        response_class (Optional[Type[JSONResponse]]): The response class. Defaults to the project default.
+        status_code (int): The response status code.
+
+    Returns:
+        Response: The rendered response.
+    """
+
+    response_class = response_class or get_default_response_class()
+    with timed("serialize"):
+        if not issubclass(response_class, FastJSONResponse):
+            content = (
+                dump_trusted(content, "json")
+                if isinstance(content, BaseModel)
+                else jsonable_encoder(content)
+            )
+
+        return response_class(content, status_code=status_code)
+
+
+def get_default_response_class() -> Type[JSONResponse]:
+    """
+    Get the application-wide default response class from the project settings.
+
+    Returns:
+        Type[JSONResponse]: FastJSONResponse or FastAPI's stdlib based JSONResponse.
+    """
+
+    if project_settings.response_class == "orjson":
+        return FastJSONResponse
+
+    return JSONResponse
+
+
+def add_response_headers(request: Request, headers: dict[str, str]) -> None:
+    """
+    Add headers to the response of the current request, from dependencies or helpers
+    that don't build the response themselves. Needs a HeadersRoute route.
+
+    Args:
+        request (Request): The request.
+        headers (dict[str, str]): The headers, ex: the ETag.
+    """
+
+    if not hasattr(request.state, "response_headers"):
+        request.state.response_headers = {}
+
+    request.state.response_headers.update(headers)
+
+
+class HeadersRoute(APIRoute):
+    """
+    Route adding the headers from 'add_response_headers' to its response,
+    whether FastAPI or the endpoint built it.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+
+        async def headers_handler(request: Request) -> Response:
+            # Seen by the instrumentation of the work the request runs, ex: slow queries
+            token = current_route.set(f"{request.method} {self.path_format}")
+            try:
+                response = await handler(request)
+            finally:
+                current_route.reset(token)
+
+            for key, value in getattr(request.state, "response_headers", {}).items():
+                response.headers.setdefault(key, value)
+
+            return response
+
+        return headers_handler
+
+
+class TrustedRoute(HeadersRoute):
+    """
+    Route whose endpoint returns an already-built response schema.
+    The content goes straight to the response class, skipping FastAPI's response
+    validation and 'jsonable_encoder' walk.
+    """
+
+    def __init__(self, path: str, endpoint: Callable[..., Any], **kwargs: Any):
+        # Routes are re-created by every 'include_router', always wrap the original endpoint
+        endpoint = getattr(endpoint, "__trusted_endpoint__", endpoint)
+
+        @functools.wraps(endpoint)
+        async def trusted_endpoint(*args: Any, **endpoint_kwargs: Any) -> Response:
+            content = await endpoint(*args, **endpoint_kwargs)
+            if isinstance(content, Response):
+                return content
+
+            response_class = self.response_class
+            if isinstance(response_class, DefaultPlaceholder):
+                response_class = response_class.value
+
+            return build_trusted_response(
+                content, response_class, self.status_code or 200
+            )
+
+        trusted_endpoint.__trusted_endpoint__ = endpoint
+
+        super().__init__(path, trusted_endpoint, **kwargs)
+
+
+def trusted_response(model: Any) -> dict[str, Any]:
+    """
+    Route options to document 'model' as the response without FastAPI re-validating it.
+
+    Only use it on routes whose DTO already returns instances of 'model' (built by the parsers),
+    otherwise the response shape is no longer enforced.
+
+    Args:
+        model (Any): The response schema, ex: PaginatedResponse[TagOut].
+
+    Returns:
+        dict[str, Any]: Keyword arguments for 'APIRouter.add_api_route'.
+    """
+
+    return {
+        "response_model": None,
+        "responses": {200: {"model": model}},
+        "route_class_override": TrustedRoute,
+    }
@@ -0,0 +1,230 @@
+"""Slow query log"""
+
+import logging
+import random
+import time
+from datetime import datetime, timezone
+from threading import Lock
+from typing import Any, Optional
+
+import orjson
+from pydantic import BaseModel
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from digital_folder.core.config import project_settings
+from digital_folder.core.timing import current_route
+
+logger = logging.getLogger(__name__)
+
+# Statements that can be explained, the others (SAVEPOINT, LISTEN...) are only timed
+EXPLAINABLE = ("select", "insert", "update", "delete", "with")
+
+
+class SlowQuery(BaseModel):
+    """Slow Query schema"""
+
+    statement: str
+    count: int
+    total_ms: float
+    max_ms: float
+    last_ms: float
+    last_seen: datetime
+    # Of the last slow run, ex: "GET /api/projects/list"
+    route: Optional[str] = None
+    # Types of the bound parameters, never their values
+    params: Any = None
+    # Last captured plan, None if none was sampled yet
+    plan: Optional[str] = None
+
+
+class SlowQueryLog:
+    def __init__(self, size: int, window: float):
+        """
+        Rolling table of the slowest statements, by total time spent over the threshold.
+        Thread-safe, statements run in the db executor.
+
+        Args:
+            size (int): Statements returned by 'top', twice as many are kept to rank them.
+            window (float): Seconds a statement is kept after it was last slow.
+        """
+
+        self.size = size
+        self.window = window
+        self.entries: dict[str, SlowQuery] = {}
+        self._lock = Lock()
+
+    def record(
+        self,
+        statement: str,
+        duration_ms: float,
+        route: Optional[str],
+        params: Any,
+        plan: Optional[str],
+    ) -> None:
+        now = datetime.now(timezone.utc)
+        with self._lock:
+            entry = self.entries.get(statement)
+            if entry is None:
+                entry = self.entries[statement] = SlowQuery(
+                    statement=statement,
+                    count=0,
+                    total_ms=0,
+                    max_ms=0,
+                    last_ms=0,
+                    last_seen=now,
+                )
+
+            entry.count += 1
+            entry.total_ms += duration_ms
+            entry.max_ms = max(entry.max_ms, duration_ms)
+            entry.last_ms = duration_ms
+            entry.last_seen = now
+            entry.route = route
+            entry.params = params
+            if plan is not None:
+                entry.plan = plan
+
+            if len(self.entries) > 2 * self.size:
+                self.prune(now)
+
+    def prune(self, now: datetime) -> None:
+        """Drop the statements out of the window, then the least costly ones over capacity"""
+
+        for statement, entry in list(self.entries.items()):
+            if (now - entry.last_seen).total_seconds() > self.window:
+                del self.entries[statement]
+
+        overflow = len(self.entries) - 2 * self.size
+        if overflow > 0:
+            for entry in sorted(self.entries.values(), key=lambda e: e.total_ms)[
+                :overflow
+            ]:
+                del self.entries[entry.statement]
+
+    def top(self) -> list[SlowQuery]:
+        """
+        Get the slowest statements of the window.
+
+        Returns:
+            list[SlowQuery]: Up to 'size' statements, by total time desc.
+        """
+
+        with self._lock:
+            self.prune(datetime.now(timezone.utc))
+            entries = [entry.model_copy() for entry in self.entries.values()]
+
+        return sorted(entries, key=lambda e: e.total_ms, reverse=True)[: self.size]
+
+
+slow_query_log = SlowQueryLog(
+    size=project_settings.slow_query_top_n, window=project_settings.slow_query_window
+)
+
+
+def parameter_shapes(parameters: Any) -> Any:
+    """
+    Describe bound parameters without their values, they can hold user data.
+
+    Args:
+        parameters (Any): The DBAPI parameters, a dict, a sequence or a list of them (executemany).
+
+    Returns:
+        Any: The same structure with type names, ex: {"title_1": "str(12)", "param_1": "int"}.
+    """
+
+    if isinstance(parameters, dict):
+        return {key: parameter_shapes(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if len(parameters) > 10:
+            return f"{type(parameters).__name__}[{len(parameters)}]"
+        return [parameter_shapes(value) for value in parameters]
+    if isinstance(parameters, (str, bytes)):
+        return f"{type(parameters).__name__}({len(parameters)})"
+
+    return type(parameters).__name__
+
+
+def explain(cursor, statement: str, parameters: Any) -> Optional[str]:
+    """
+    Get the plan of a statement, without running it (no ANALYZE). Runs on the raw DBAPI
+    connection so it isn't timed itself, in a savepoint so a failure leaves the transaction usable.
+
+    Args:
+        cursor: The DBAPI cursor that ran the statement.
+        statement (str): The statement.
+        parameters (Any): Its DBAPI parameters.
+
+    Returns:
+        Optional[str]: The plan, None if it can't be explained.
+    """
+
+    if not statement.lstrip().lower().startswith(EXPLAINABLE):
+        return None
+
+    connection = cursor.connection
+    savepoint = not connection.autocommit
+    with connection.cursor() as explain_cursor:
+        try:
+            if savepoint:
+                explain_cursor.execute("SAVEPOINT slow_query_explain")
+            explain_cursor.execute(f"EXPLAIN (ANALYZE off) {statement}", parameters)
+            plan = "\n".join(row[0] for row in explain_cursor.fetchall())
+            if savepoint:
+                explain_cursor.execute("RELEASE SAVEPOINT slow_query_explain")
+            return plan
+        except Exception as exc:
+            logger.debug("Slow query EXPLAIN failed: %r", exc)
+            if savepoint:
+                try:
+                    explain_cursor.execute("ROLLBACK TO SAVEPOINT slow_query_explain")
+                except Exception:
+                    pass
+            return None
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._slow_query_started_at = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    duration_ms = (time.perf_counter() - context._slow_query_started_at) * 1000
+    if duration_ms < project_settings.slow_query_threshold_ms:
+        return
+
+    route = current_route.get()
+    params = parameter_shapes(parameters)
+    # Only a sample of the slow statements is logged and explained, all are counted
+    sampled = random.random() < project_settings.slow_query_sample_rate
+    plan = None
+    if sampled and project_settings.slow_query_explain and not executemany:
+        plan = explain(cursor, statement, parameters)
+
+    slow_query_log.record(statement, duration_ms, route, params, plan)
+
+    if sampled:
+        logger.warning(
+            orjson.dumps(
+                {
+                    "slow_query": round(duration_ms, 2),
+                    "route": route,
+                    "statement": statement,
+                    "params": params,
+                    "plan": plan,
+                }
+            ).decode()
+        )
+
+
+def instrument_slow_queries(engine: Engine) -> None:
+    """
+    Time every statement run by the engine and report the ones over 'slow_query_threshold_ms'.
+    Only called when the slow query log is enabled.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine.
+    """
+
+    if not event.contains(engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
@@ -0,0 +1,118 @@
+"""Per-request phase timings"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from threading import Lock
+from typing import Iterator, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+
+class RequestTimings:
+    def __init__(self):
+        """
+        Durations and counts of the phases of a request, ex: "sql", "storage", "serialize".
+        Filled from the event loop and the executor threads the request runs work in.
+        """
+
+        self.started_at = time.perf_counter()
+        # Phase -> [seconds, count]
+        self.phases: dict[str, list] = {}
+        self._lock = Lock()
+
+    def add(self, phase: str, duration: float) -> None:
+        with self._lock:
+            totals = self.phases.setdefault(phase, [0.0, 0])
+            totals[0] += duration
+            totals[1] += 1
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def server_timing(self) -> str:
+        """
+        Build the Server-Timing header value, durations in milliseconds.
+
+        Returns:
+            str: ex: 'sql;dur=12.4;desc="5 calls", total;dur=20.1'.
+        """
+
+        with self._lock:
+            metrics = [
+                f'{phase};dur={duration * 1000:.1f};desc="{count} calls"'
+                for phase, (duration, count) in self.phases.items()
+            ]
+        metrics.append(f"total;dur={self.elapsed() * 1000:.1f}")
+
+        return ", ".join(metrics)
+
+    def summary(self) -> dict[str, dict[str, float]]:
+        """
+        Phase timings for the structured log, durations in milliseconds.
+
+        Returns:
+            dict[str, dict[str, float]]: Phase -> {"ms", "count"}.
+        """
+
+        with self._lock:
+            return {
+                phase: {"ms": round(duration * 1000, 2), "count": count}
+                for phase, (duration, count) in self.phases.items()
+            }
+
+
+# Set by ServerTimingMiddleware, None when timings are disabled or outside a request
+request_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+# Method and route template of the current request, set by HeadersRoute, ex: "GET /api/projects/list"
+current_route: ContextVar[Optional[str]] = ContextVar("current_route", default=None)
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """
+    Add the duration of the block to a phase of the current request. No-op outside a timed request.
+
+    Args:
+        phase (str): The phase name, ex: "storage".
+    """
+
+    timings = request_timings.get()
+    if timings is None:
+        yield
+        return
+
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(phase, time.perf_counter() - start)
+
+
+def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    context._timing_started_at = time.perf_counter()
+
+
+def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    timings = request_timings.get()
+    if timings is not None:
+        timings.add("sql", time.perf_counter() - context._timing_started_at)
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Time every statement run by the engine, lazy loads included, into the "sql" phase.
+    Only called when timings are enabled, so disabled timings cost nothing per query.
+
+    Args:
+        engine (Engine): The SQLAlchemy engine.
+    """
+
+    if not event.contains(engine, "before_cursor_execute", before_cursor_execute):
+        event.listen(engine, "before_cursor_execute", before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", after_cursor_execute)
@@ -1,7 +1,13 @@
+import time
+
 from sqlalchemy import create_engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
 from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy.pool import QueuePool
 
 from digital_folder.core.config import project_settings
+from digital_folder.core.metrics import db_pool_checkout_timeouts, db_pool_checkout_wait
+from digital_folder.helpers.executor import BoundedExecutor
 
 
 def get_db_url() -> str:
@@ -17,8 +23,39 @@ def get_db_url() -> str:
     return db_url[env]
 
 
+class TimedQueuePool(QueuePool):
+    """QueuePool recording how long checkouts wait for a connection, see '/server/metrics'"""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            db_pool_checkout_timeouts.inc()
+            raise
+        finally:
+            db_pool_checkout_wait.observe(time.perf_counter() - start)
+
+
 # SQLAlchemy engine
-engine = create_engine(str(get_db_url()), echo=project_settings.debug, future=True)
+engine = create_engine(
+    str(get_db_url()),
+    echo=project_settings.debug,
+    future=True,
+    poolclass=TimedQueuePool,
+    pool_size=project_settings.db_pool_size,
+    max_overflow=project_settings.db_max_overflow,
+    pool_timeout=project_settings.db_pool_timeout,
+)
+
+# Blocking DTO work (queries, Supabase calls) runs here, off the event loop.
+# One worker per pool connection, so running work never waits for a connection.
+db_executor = BoundedExecutor(
+    name="db",
+    max_workers=engine.pool.size() + project_settings.db_max_overflow,
+    max_queue=project_settings.db_executor_queue,
+    queue_timeout=project_settings.db_executor_queue_timeout,
+)
 
 # Session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
@@ -1,13 +1,50 @@
 import enum
 import uuid
 
-from sqlalchemy import Column, DateTime, Enum, ForeignKey, func, String, Table, Text
+from sqlalchemy import (
+    BigInteger,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Integer,
+    func,
+    Sequence,
+    String,
+    Table,
+    text,
+    Text,
+)
 from sqlalchemy.dialects.postgresql import ARRAY, UUID
 from sqlalchemy.orm import relationship
 
 from digital_folder.db.db import Base
 
 
+# Shared by every synced table, so versions order the changes across tables
+change_version_seq = Sequence("change_version_seq", metadata=Base.metadata)
+
+
+class Versioned:
+    """
+    Change tracking of the tables clients sync, see '/sync'.
+    The version is assigned on insert, then moved forward by DbService on every change.
+    """
+
+    updated_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+    version = Column(
+        BigInteger,
+        server_default=text("nextval('change_version_seq')"),
+        nullable=False,
+        index=True,
+    )
+
+    # Read back by the insert (RETURNING), the change event needs it before commit
+    __mapper_args__ = {"eager_defaults": True}
+
+
 class UserRole(enum.Enum):
     ADMIN = "ADMIN"
     USER = "USER"
@@ -23,6 +60,27 @@ class User(Base):
     role = Column(Enum(UserRole), unique=True, nullable=False)
 
 
+class RefreshToken(Base):
+    __tablename__ = "refresh_tokens"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    token_hash = Column(String, unique=True, nullable=False, index=True)
+    user_id = Column(
+        UUID(as_uuid=True),
+        ForeignKey("users.id", ondelete="CASCADE"),
+        nullable=False,
+        index=True,
+    )
+    expires_at = Column(DateTime(timezone=True), nullable=False)
+    # 'jwt_token_version' at issue time, bumping it revokes the refresh tokens too
+    token_version = Column(Integer, nullable=False, server_default="1")
+    created_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
+
+    user = relationship("User")
+
+
 project_tag_relations = Table(
     "project_tag_relations",
     Base.metadata,
@@ -54,7 +112,7 @@ class ProjectUrl(Base):
     project = relationship("Project", back_populates="urls")
 
 
-class Project(Base):
+class Project(Base, Versioned):
     __tablename__ = "projects"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -77,7 +135,7 @@ class Project(Base):
     )
 
 
-class Tag(Base):
+class Tag(Base, Versioned):
     __tablename__ = "tags"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -100,7 +158,7 @@ class Tag(Base):
     group = relationship("Group", back_populates="tags")
 
 
-class Group(Base):
+class Group(Base, Versioned):
     __tablename__ = "groups"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -117,7 +175,7 @@ class TicketStatus(enum.Enum):
     CLOSED = "CLOSED"
 
 
-class Ticket(Base):
+class Ticket(Base, Versioned):
     __tablename__ = "tickets"
 
     id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
@@ -132,3 +190,23 @@ class Ticket(Base):
         DateTime(timezone=True), server_default=func.now(), nullable=False
     )
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+
+class Tombstone(Base):
+    __tablename__ = "tombstones"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    # Table of the deleted row, ex: "projects"
+    entity = Column(String, nullable=False)
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    # No foreign key, the tombstone outlives the row and may outlive its owner
+    created_by = Column(UUID(as_uuid=True), nullable=True, index=True)
+    version = Column(
+        BigInteger,
+        server_default=text("nextval('change_version_seq')"),
+        nullable=False,
+        index=True,
+    )
+    deleted_at = Column(
+        DateTime(timezone=True), server_default=func.now(), nullable=False
+    )
@@ -1,29 +1,63 @@
-from typing import List, Optional, Type
+from threading import RLock
+from typing import Any, Callable, List, Optional, Type
 from uuid import UUID
 
-from sqlalchemy import asc, desc
-from sqlalchemy.orm import InstrumentedAttribute
-
-from digital_folder.core.pagination.types import QueryParams
-from digital_folder.db.db import SessionLocal
-from digital_folder.db.models import Group, Project, Tag
+from sqlalchemy import asc, delete, desc, func, insert, select, text, update
+from sqlalchemy.orm import InstrumentedAttribute, load_only
+
+from digital_folder.core import response_cache
+from digital_folder.core.changes import change_bus, notification_payload
+from digital_folder.core.config import project_settings
+from digital_folder.core.pagination.types import Fieldset, QueryParams
+from digital_folder.db.db import Base, SessionLocal
+from digital_folder.db.models import (
+    Group,
+    Project,
+    ProjectUrl,
+    Tag,
+    project_tag_relations,
+    Tombstone,
+    User,
+    Versioned,
+)
 from digital_folder.db.types import ModelType
+from digital_folder.db.versions import collection_versions
+from digital_folder.packages.Change.schemas import ChangeEvent, ChangeOp
+from digital_folder.packages.User.cache import role_user_id_cache, user_roles
 from digital_folder.packages.User.schemas import UserDb
 
+# Advisory lock key of versioned writes, see 'DbService.lock_versions'
+VERSIONS_LOCK = 4620
+
 
 class DbService:
     def __init__(self, user: Optional[UserDb] = None):
         self.user = user
+        # Held while a batch sub-request uses the session, sessions aren't thread-safe
+        self.lock = RLock()
 
     def __enter__(self):
         self.db = SessionLocal()
+        # Taken before any read, so data derived from this session is never newer than its version
+        self.versions = collection_versions.snapshot()
         return self
 
     def __exit__(self, exc_type, exc_val, exc_tb):
         self.db.close()
 
+    def release(self) -> None:
+        """
+        End the current read transaction, returning its connection to the pool
+        until the next query. Loaded objects are expired.
+        """
+
+        self.db.rollback()
+
     def get_all(
-        self, model: Type[ModelType], params: Optional[QueryParams] = None
+        self,
+        model: Type[ModelType],
+        params: Optional[QueryParams] = None,
+        options: Optional[List[Any]] = None,
     ) -> tuple[List[ModelType], int]:
         """
         Retrieve all rows from the given SQLAlchemy model.
@@ -31,15 +65,18 @@ class DbService:
         Args:
             model (Type[ModelType]): The SQLAlchemy ORM model class to query.
             params (Optional[QueryParams]): Query parameters that may contain filters or search.
+            options (Optional[List[Any]]): SQLAlchemy loader options, see 'load_options'.
 
         Returns:
             tuple[List[ModelType], int]: A list of db rows from the provided model. The total number of rows.
         """
 
         query = self.db.query(model)
+        if options:
+            query = query.options(*options)
         count = 0
 
-        if self.user.filter_id:
+        if self.user and self.user.filter_id:
             query = query.filter(model.created_by == self.user.filter_id)
 
         if params:
@@ -89,19 +126,63 @@ class DbService:
 
         return query.all(), count
 
-    def get_by_id(self, model: Type[ModelType], obj_id: UUID) -> Optional[ModelType]:
+    def get_by_id(
+        self,
+        model: Type[ModelType],
+        obj_id: UUID,
+        options: Optional[List[Any]] = None,
+    ) -> Optional[ModelType]:
         """
         Retrieve a single row by ID.
 
         Args:
             model (Type[ModelType]): The SQLAlchemy ORM model class to query.
             obj_id (UUID): ID of the object to filter by.
+            options (Optional[List[Any]]): SQLAlchemy loader options, see 'load_options'.
 
         Returns:
             Optional[ModelType]: A single db row, if found, from the provided model.
         """
 
-        return self.db.query(model).filter_by(id=obj_id).first()
+        query = self.db.query(model)
+        if options:
+            query = query.options(*options)
+
+        return query.filter_by(id=obj_id).first()
+
+    @staticmethod
+    def load_options(
+        model: Type[ModelType], fieldset: Fieldset, relations: dict[str, List[Any]]
+    ) -> List[Any]:
+        """
+        Build the loader options that fetch only the columns and relations requested by a fieldset.
+        The ID and foreign keys are always loaded since relation loading depends on them.
+
+        Args:
+            model (Type[ModelType]): The SQLAlchemy ORM model class to query.
+            fieldset (Fieldset): The requested fields and relations.
+            relations (dict[str, List[Any]]): Relation name -> loader options to eager load it.
+
+        Returns:
+            List[Any]: SQLAlchemy loader options.
+        """
+
+        options = []
+        if fieldset.fields is not None:
+            columns = [
+                getattr(model, column.key)
+                for column in model.__table__.columns
+                if column.primary_key
+                or column.foreign_keys
+                or fieldset.has_field(column.key)
+            ]
+            options.append(load_only(*columns))
+
+        for relation, relation_options in relations.items():
+            if fieldset.includes(relation):
+                options.extend(relation_options)
+
+        return options
 
     def get_by_field(
         self, model: Type[ModelType], column: InstrumentedAttribute, value: str
@@ -151,7 +232,11 @@ class DbService:
 
         db_obj = model(**obj_in)
         self.db.add(db_obj)
-        self.db.commit()
+        if issubclass(model, Versioned):
+            self.lock_versions()
+        # Assigns the ID and version the change event needs
+        self.db.flush()
+        self.commit(model, self.change_event(db_obj, ChangeOp.CREATE))
         self.db.refresh(db_obj)
         return db_obj
 
@@ -169,7 +254,7 @@ class DbService:
 
         for field, value in updates.items():
             setattr(obj, field, value)
-        self.db.commit()
+        self.commit(model, self.change_event(obj, ChangeOp.UPDATE))
         self.db.refresh(obj)
 
     def delete(self, model: Type[ModelType], obj_id: UUID) -> None:
@@ -182,9 +267,239 @@ class DbService:
         """
 
         obj = self.get_by_id(model, obj_id)
+        # Built before the row is gone
+        event = self.change_event(obj, ChangeOp.DELETE)
 
         self.db.delete(obj)
+        self.commit(model, event)
+
+    def consume_by_field(
+        self, model: Type[ModelType], column: InstrumentedAttribute, value: str
+    ) -> Optional[ModelType]:
+        """
+        Delete a single row by a dynamic field and return it, atomically.
+        Concurrent calls for the same row can't both get it, ex: single-use tokens.
+
+        Args:
+            model (Type[ModelType]): The SQLAlchemy ORM model class to query.
+            column (InstrumentedAttribute): The column to filter by.
+            value (str): The value to match.
+
+        Returns:
+            Optional[ModelType]: The deleted row, detached, None if another caller consumed it first.
+        """
+
+        obj = self.db.scalars(
+            delete(model)
+            .where(column == value)
+            .returning(model)
+            .execution_options(synchronize_session=False)
+        ).first()
+        if obj is not None:
+            # Keep its loaded attributes, the row can't be refreshed after the commit
+            self.db.expunge(obj)
+        self.commit(model, None)
+
+        return obj
+
+    def commit(self, model: Type[ModelType], event: Optional[ChangeEvent]) -> None:
+        """
+        Commit a write, then drop the caches derived from the written model and publish its change.
+        The other workers are notified in the same transaction, so only committed writes reach them.
+
+        Args:
+            model (Type[ModelType]): The SQLAlchemy ORM model class that was written.
+            event (Optional[ChangeEvent]): The change event, if clients can see the write.
+        """
+
+        if event is not None:
+            embedding = set()
+            if event.op is not ChangeOp.CREATE:
+                # Inserts were versioned by their flush
+                self.lock_versions()
+                # Before the write is flushed, ex: the projects of a deleted tag
+                embedding = self.embedding_rows(event)
+                event.version = self.track_change(event)
+
+            self.db.flush()
+            self.track_embedding(embedding | self.embedding_rows(event))
+
+        if project_settings.changes_notify_enabled:
+            self.db.execute(
+                select(
+                    func.pg_notify(
+                        project_settings.changes_channel,
+                        notification_payload(model.__tablename__, event),
+                    )
+                )
+            )
+
         self.db.commit()
+        self.versions[model.__tablename__] = apply_change(model.__tablename__, event)
+
+    def lock_versions(self) -> None:
+        """
+        Serialize versioned writes until commit, so they commit in version order
+        and a sync never skips a version committed after a greater one.
+        """
+
+        self.db.execute(select(func.pg_advisory_xact_lock(VERSIONS_LOCK)))
+
+    def track_change(self, event: ChangeEvent) -> int:
+        """
+        Move the version of an updated row forward, or leave a tombstone for a deleted one.
+        Relation and project url writes don't update the row itself, so this is done for them too.
+
+        Args:
+            event (ChangeEvent): The change event.
+
+        Returns:
+            int: The version of the change.
+        """
+
+        if event.op is ChangeOp.DELETE:
+            statement = insert(Tombstone).values(
+                entity=event.entity, entity_id=event.id, created_by=event.owner
+            )
+            return self.db.execute(statement.returning(Tombstone.version)).scalar_one()
+
+        table = Base.metadata.tables[event.entity]
+        statement = (
+            update(table)
+            .where(table.c.id == event.id)
+            .values(
+                version=text("nextval('change_version_seq')"), updated_at=func.now()
+            )
+        )
+        return self.db.execute(statement.returning(table.c.version)).scalar_one()
+
+    def embedding_rows(self, event: ChangeEvent) -> set[tuple[str, UUID]]:
+        """
+        Find the rows whose payload embeds a written one: projects embed their tags,
+        groups embed their tags and tags embed their group.
+
+        Args:
+            event (ChangeEvent): The change event.
+
+        Returns:
+            set[tuple[str, UUID]]: The (entity, id) of the embedding rows.
+        """
+
+        if event.entity == Tag.__tablename__:
+            tag_ids = [event.id]
+            group_ids = self.db.scalars(select(Tag.group_id).where(Tag.id == event.id))
+            rows = {(Group.__tablename__, group_id) for group_id in group_ids}
+        elif event.entity == Group.__tablename__:
+            tag_ids = list(
+                self.db.scalars(select(Tag.id).where(Tag.group_id == event.id))
+            )
+            rows = {(Tag.__tablename__, tag_id) for tag_id in tag_ids}
+        else:
+            return set()
+
+        project_ids = self.db.scalars(
+            select(project_tag_relations.c.project_id)
+            .where(project_tag_relations.c.tag_id.in_(tag_ids))
+            .distinct()
+        )
+        rows.update((Project.__tablename__, project_id) for project_id in project_ids)
+
+        return rows
+
+    def track_embedding(self, rows: set[tuple[str, UUID]]) -> None:
+        """
+        Move the version of the rows embedding a written one forward,
+        so a sync sends them again with the written row as it is now.
+
+        Args:
+            rows (set[tuple[str, UUID]]): The (entity, id) of the embedding rows, see 'embedding_rows'.
+        """
+
+        if not rows:
+            return
+
+        ids: dict[str, list[UUID]] = {}
+        for entity, row_id in rows:
+            ids.setdefault(entity, []).append(row_id)
+
+        for entity, row_ids in ids.items():
+            table = Base.metadata.tables[entity]
+            self.db.execute(
+                update(table)
+                .where(table.c.id.in_(row_ids))
+                .values(
+                    version=text("nextval('change_version_seq')"),
+                    updated_at=func.now(),
+                )
+            )
+
+    def get_changed(
+        self,
+        model: Type[ModelType],
+        since: int,
+        limit: int,
+        options: Optional[List[Any]] = None,
+    ) -> List[ModelType]:
+        """
+        Retrieve the rows changed after a version, in version order, within the user scope.
+
+        Args:
+            model (Type[ModelType]): A versioned SQLAlchemy ORM model class, or Tombstone.
+            since (int): Version the rows must be greater than.
+            limit (int): Max number of rows.
+            options (Optional[List[Any]]): SQLAlchemy loader options, see 'load_options'.
+
+        Returns:
+            List[ModelType]: The changed rows.
+        """
+
+        query = self.db.query(model)
+        if options:
+            query = query.options(*options)
+
+        if self.user and self.user.filter_id:
+            query = query.filter(model.created_by == self.user.filter_id)
+
+        return (
+            query.filter(model.version > since)
+            .order_by(model.version.asc())
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def change_event(obj: ModelType, op: ChangeOp) -> Optional[ChangeEvent]:
+        """
+        Build the change event of a written row.
+        Project urls are reported as an update of their project.
+
+        Args:
+            obj (ModelType): The written row.
+            op (ChangeOp): The write operation.
+
+        Returns:
+            Optional[ChangeEvent]: The change event, or None for internal models, ex: User.
+        """
+
+        if isinstance(obj, ProjectUrl):
+            return ChangeEvent(
+                entity=Project.__tablename__,
+                id=obj.project_id,
+                op=ChangeOp.UPDATE,
+                owner=obj.project.created_by,
+            )
+
+        if not hasattr(obj, "created_by"):
+            return None
+
+        return ChangeEvent(
+            entity=obj.__tablename__,
+            id=obj.id,
+            op=op,
+            # Only known yet for inserts, see 'track_change'
+            version=obj.version if op is ChangeOp.CREATE else 0,
+            owner=obj.created_by,
+        )
 
     def update_relations(
         self,
@@ -214,5 +529,64 @@ class DbService:
 
         # Only used as: project.tags = tags
         setattr(entity_obj, relation_name, related_objs)
-        self.db.commit()
+        self.commit(entity_model, self.change_event(entity_obj, ChangeOp.UPDATE))
         self.db.refresh(entity_obj)
+
+
+def run_in_session(user: Optional[UserDb], func: Callable[[DbService], Any]) -> Any:
+    """
+    Run a blocking call with its own db session, for work that may outlive the request
+    and its session, ex: an idempotent write kept running after its request was cancelled.
+
+    Args:
+        user (Optional[UserDb]): The user the session acts for.
+        func (Callable[[DbService], Any]): The call, given the session.
+
+    Returns:
+        Any: The call result.
+    """
+
+    with DbService(user) as db:
+        return func(db)
+
+
+def invalidate_collection(collection: str) -> int:
+    """
+    Bump the version of a collection after a write
+    and drop process-wide caches derived from it.
+
+    Args:
+        collection (str): The written collection (table).
+
+    Returns:
+        int: The new collection version.
+    """
+
+    version = collection_versions.bump(collection)
+    response_cache.response_cache.invalidate(collection)
+
+    if collection == User.__tablename__:
+        role_user_id_cache.clear()
+        user_roles.clear()
+
+    return version
+
+
+def apply_change(collection: str, event: Optional[ChangeEvent]) -> int:
+    """
+    Apply a committed write of this worker or, through the change listener, of another one:
+    invalidate the collection and send its change to the change streams.
+
+    Args:
+        collection (str): The written collection (table).
+        event (Optional[ChangeEvent]): The change event, if clients can see the write.
+
+    Returns:
+        int: The new collection version.
+    """
+
+    version = invalidate_collection(collection)
+    if event is not None:
+        change_bus.publish(event)
+
+    return version
@@ -0,0 +1,43 @@
+from threading import Lock
+
+
+class CollectionVersions:
+    def __init__(self):
+        """
+        Per-collection (table) write counters, bumped by DbService after every committed write.
+        Anything derived from a collection can be keyed by its version instead of being invalidated.
+        """
+
+        self._versions: dict[str, int] = {}
+        self._lock = Lock()
+
+    def bump(self, collection: str) -> int:
+        """
+        Increase the version of a collection.
+
+        Args:
+            collection (str): The collection (table) name.
+
+        Returns:
+            int: The new version.
+        """
+
+        with self._lock:
+            version = self._versions.get(collection, 0) + 1
+            self._versions[collection] = version
+
+            return version
+
+    def snapshot(self) -> dict[str, int]:
+        """
+        Copy of the current version of every collection.
+
+        Returns:
+            dict[str, int]: Collection name -> version.
+        """
+
+        with self._lock:
+            return dict(self._versions)
+
+
+collection_versions = CollectionVersions()
@@ -0,0 +1,119 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Generic, Hashable, Optional, TypeVar
+
+from pydantic import BaseModel
+
+ValueType = TypeVar("ValueType")
+
+
+class CacheStats(BaseModel):
+    """Cache Stats schema"""
+
+    size: int
+    maxsize: int
+    hits: int
+    misses: int
+
+
+class LRUCache(Generic[ValueType]):
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        """
+        Thread-safe, bounded least-recently-used cache with optional per-entry expiry.
+
+        Args:
+            maxsize (int): Maximum number of entries. 0 disables the cache.
+            ttl (Optional[float]): Default time to live in seconds for entries without an explicit expiry.
+        """
+
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[Hashable, tuple[ValueType, Optional[float]]] = (
+            OrderedDict()
+        )
+        self._lock = Lock()
+
+    def get(self, key: Hashable) -> Optional[ValueType]:
+        """
+        Retrieve a cached value and mark it as recently used.
+
+        Args:
+            key (Hashable): The cache key.
+
+        Returns:
+            Optional[ValueType]: The cached value, or None if missing or expired.
+        """
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at is None or expires_at > time.time():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+
+                del self._entries[key]
+
+            self.misses += 1
+            return None
+
+    def set(
+        self, key: Hashable, value: ValueType, expires_at: Optional[float] = None
+    ) -> None:
+        """
+        Store a value, evicting the least recently used entry when full.
+
+        Args:
+            key (Hashable): The cache key.
+            value (ValueType): The value to cache.
+            expires_at (Optional[float]): Unix timestamp after which the entry is discarded.
+        """
+
+        if self.maxsize <= 0:
+            return
+
+        if expires_at is None and self.ttl is not None:
+            expires_at = time.time() + self.ttl
+
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def delete(self, key: Hashable) -> None:
+        """
+        Remove a single entry, if present.
+
+        Args:
+            key (Hashable): The cache key.
+        """
+
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        """Remove every entry."""
+
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        """
+        Snapshot of the cache size and hit/miss counters.
+
+        Returns:
+            CacheStats: The cache stats.
+        """
+
+        with self._lock:
+            return CacheStats(
+                size=len(self._entries),
+                maxsize=self.maxsize,
+                hits=self.hits,
+                misses=self.misses,
+            )
@@ -0,0 +1,137 @@
+import asyncio
+import contextvars
+import functools
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+
+from fastapi import HTTPException, status
+
+from digital_folder.core.timing import request_timings
+
+ResultType = TypeVar("ResultType")
+
+
+class BoundedExecutor:
+    def __init__(
+        self,
+        name: str,
+        max_workers: int,
+        max_queue: int,
+        queue_timeout: Optional[float] = None,
+    ):
+        """
+        Thread pool that runs blocking work off the event loop and rejects work once full.
+
+        Args:
+            name (str): Name used for the worker threads and error messages.
+            max_workers (int): Max number of calls running at the same time.
+            max_queue (int): Max number of calls waiting for a free worker before failing fast.
+            queue_timeout (Optional[float]): Max seconds a call waits for a free worker before
+            being dropped. Calls already running are never interrupted.
+        """
+
+        self.name = name
+        self.max_workers = max_workers
+        self.max_pending = max_workers + max_queue
+        self.queue_timeout = queue_timeout
+        self.pending = 0
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix=name
+        )
+
+    async def run(
+        self, func: Callable[..., ResultType], *args: Any, **kwargs: Any
+    ) -> ResultType:
+        """
+        Run a blocking callable in the pool and await its result.
+        A cancelled caller drops the call if it's still queued, otherwise waits for it
+        before the cancellation propagates, like the threadpool of FastAPI sync routes.
+
+        Args:
+            func (Callable[..., ResultType]): The blocking callable.
+            *args (Any): Positional arguments for the callable.
+            **kwargs (Any): Keyword arguments for the callable.
+
+        Returns:
+            ResultType: The callable result.
+        """
+
+        # Only touched from the event loop thread, so no lock is needed
+        if self.pending >= self.max_pending:
+            raise self.busy()
+
+        call = functools.partial(func, *args, **kwargs)
+        timings = request_timings.get()
+        if timings is not None:
+            call = functools.partial(self.timed_call, call, time.perf_counter())
+
+        # Keeps the request context (timings...) in the worker thread
+        work = self.executor.submit(contextvars.copy_context().run, call)
+        future = asyncio.wrap_future(work)
+        future.add_done_callback(self.retrieve)
+
+        # Released when the work is done (or dropped), not when the caller stops waiting
+        loop = asyncio.get_running_loop()
+        self.pending += 1
+        work.add_done_callback(lambda _: loop.call_soon_threadsafe(self.release))
+
+        try:
+            if self.queue_timeout is None:
+                return await asyncio.shield(future)
+
+            try:
+                return await asyncio.wait_for(
+                    asyncio.shield(future), self.queue_timeout
+                )
+            except asyncio.TimeoutError:
+                # Only succeeds if no worker picked it up yet
+                if work.cancel():
+                    raise self.busy()
+
+                return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            # A running call may use what the caller tears down once cancelled,
+            # ex: its db session, so wait for it unless it can still be dropped
+            if not work.cancel():
+                await self.wait_done(future)
+            raise
+
+    def timed_call(
+        self, call: Callable[[], ResultType], queued_at: float
+    ) -> ResultType:
+        """Run a call, adding its wait for a worker and its run time to the request timings"""
+
+        timings = request_timings.get()
+        started_at = time.perf_counter()
+        timings.add(f"{self.name}-wait", started_at - queued_at)
+        try:
+            return call()
+        finally:
+            timings.add(self.name, time.perf_counter() - started_at)
+
+    @staticmethod
+    async def wait_done(future: asyncio.Future) -> None:
+        """Wait for a call to finish, through any further cancellation of the caller"""
+
+        while not future.done():
+            try:
+                await asyncio.wait([future])
+            except asyncio.CancelledError:
+                continue
+
+    def release(self) -> None:
+        self.pending -= 1
+
+    @staticmethod
+    def retrieve(future: asyncio.Future) -> None:
+        if not future.cancelled():
+            # Mark it retrieved, the caller may be gone
+            future.exception()
+
+    def busy(self) -> HTTPException:
+        return HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Server is busy ({self.name}), try again later.",
+            headers={"Retry-After": "1"},
+        )
@@ -0,0 +1,244 @@
+import math
+from threading import Lock
+from typing import Any, Iterable, Optional, Sequence
+
+# Seconds, from a cached read to a slow Supabase upload
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+LabelValues = tuple[str, ...]
+
+
+class Metric:
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """
+        In-process metric with a value per label values combination.
+        Thread-safe, updates only take a lock and a dict lookup.
+
+        Args:
+            name (str): The metric name, ex: "http_requests_total".
+            documentation (str): The HELP text.
+            labelnames (Sequence[str]): The label names, values are passed positionally in the same order.
+        """
+
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[LabelValues, Any] = {}
+        self._lock = Lock()
+
+    def family(self) -> dict[str, Any]:
+        """
+        Snapshot of the metric, the unit merged between workers and rendered, see 'render'.
+
+        Returns:
+            dict[str, Any]: The metric type, help, label names and samples ([label values, value]).
+        """
+
+        with self._lock:
+            samples = [
+                [list(labels), self.copy(value)]
+                for labels, value in self._values.items()
+            ]
+
+        return {
+            "type": self.type,
+            "help": self.documentation,
+            "labelnames": list(self.labelnames),
+            "samples": samples,
+        }
+
+    @staticmethod
+    def copy(value: Any) -> Any:
+        return value
+
+
+class Counter(Metric):
+    type = "counter"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def set(self, value: float, *labels: str) -> None:
+        """Set the total, for collectors reading a count kept elsewhere, ex: cache hits"""
+
+        with self._lock:
+            self._values[labels] = value
+
+
+class Gauge(Metric):
+    type = "gauge"
+
+    def inc(self, *labels: str, amount: float = 1) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0) + amount
+
+    def dec(self, *labels: str, amount: float = 1) -> None:
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels: str) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+
+class Histogram(Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """
+        Histogram with fixed buckets, see 'Metric'.
+
+        Args:
+            name (str): The metric name, ex: "http_request_duration_seconds".
+            documentation (str): The HELP text.
+            labelnames (Sequence[str]): The label names.
+            buckets (Sequence[float]): Sorted bucket upper bounds, +Inf is implied.
+        """
+
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(buckets)
+
+    def observe(self, value: float, *labels: str) -> None:
+        # Per-bucket counts (not cumulative), the last one is +Inf, then the sum
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+
+        with self._lock:
+            counts = self._values.get(labels)
+            if counts is None:
+                counts = self._values[labels] = [0] * (len(self.buckets) + 2)
+            counts[index] += 1
+            counts[-1] += value
+
+    def family(self) -> dict[str, Any]:
+        family = super().family()
+        family["buckets"] = list(self.buckets)
+        return family
+
+    @staticmethod
+    def copy(value: Any) -> Any:
+        return list(value)
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """Metrics of the worker, by name"""
+
+        self.metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics[metric.name] = metric
+        return metric
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """
+        Snapshot of every metric.
+
+        Returns:
+            dict[str, dict[str, Any]]: Metric name -> family, see 'Metric.family'.
+        """
+
+        return {name: metric.family() for name, metric in self.metrics.items()}
+
+
+def merge(
+    snapshots: Iterable[dict[str, dict[str, Any]]],
+) -> dict[str, dict[str, Any]]:
+    """
+    Merge the snapshots of several workers by summing the samples with the same labels.
+    Gauges should be told apart by a worker label before, their sum is rarely meaningful.
+
+    Args:
+        snapshots (Iterable[dict[str, dict[str, Any]]]): Metric name -> family, per worker.
+
+    Returns:
+        dict[str, dict[str, Any]]: The merged snapshot.
+    """
+
+    merged: dict[str, dict[str, Any]] = {}
+    for snapshot in snapshots:
+        for name, family in snapshot.items():
+            target = merged.setdefault(name, {**family, "samples": {}})
+            for labels, value in family["samples"]:
+                key = tuple(labels)
+                current = target["samples"].get(key)
+                if current is None:
+                    target["samples"][key] = value
+                elif isinstance(value, list):
+                    target["samples"][key] = [a + b for a, b in zip(current, value)]
+                else:
+                    target["samples"][key] = current + value
+
+    for family in merged.values():
+        family["samples"] = [
+            [list(labels), value] for labels, value in family["samples"].items()
+        ]
+
+    return merged
+
+
+def render(snapshot: dict[str, dict[str, Any]]) -> str:
+    """
+    Render a snapshot in the Prometheus text exposition format (0.0.4).
+
+    Args:
+        snapshot (dict[str, dict[str, Any]]): Metric name -> family.
+
+    Returns:
+        str: The exposition text.
+    """
+
+    lines = []
+    for name, family in snapshot.items():
+        lines.append(f"# HELP {name} {escape(family['help'], False)}")
+        lines.append(f"# TYPE {name} {family['type']}")
+
+        for labels, value in family["samples"]:
+            pairs = list(zip(family["labelnames"], labels))
+            if family["type"] != "histogram":
+                lines.append(f"{name}{format_labels(pairs)} {format_value(value)}")
+                continue
+
+            cumulative = 0
+            for bound, count in zip([*family["buckets"], math.inf], value[:-1]):
+                cumulative += count
+                le = ("le", "+Inf" if bound == math.inf else format_value(bound))
+                lines.append(f"{name}_bucket{format_labels([*pairs, le])} {cumulative}")
+            lines.append(f"{name}_sum{format_labels(pairs)} {format_value(value[-1])}")
+            lines.append(f"{name}_count{format_labels(pairs)} {cumulative}")
+
+    return "\n".join(lines) + "\n"
+
+
+def format_labels(pairs: list[tuple[str, str]]) -> str:
+    if not pairs:
+        return ""
+
+    return "{" + ",".join(f'{key}="{escape(str(value))}"' for key, value in pairs) + "}"
+
+
+def format_value(value: Optional[float]) -> str:
+    if value is None or value != value:
+        return "NaN"
+    if value in (math.inf, -math.inf):
+        return "+Inf" if value > 0 else "-Inf"
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+def escape(text: str, quotes: bool = True) -> str:
+    text = text.replace("\\", "\\\\").replace("\n", "\\n")
+    return text.replace('"', '\\"') if quotes else text
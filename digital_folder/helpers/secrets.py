@@ -1,7 +1,18 @@
+import hashlib
+
 from passlib.context import CryptContext
 
+from digital_folder.core.config import project_settings
+from digital_folder.helpers.executor import BoundedExecutor
+
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
+password_executor = BoundedExecutor(
+    name="password-verify",
+    max_workers=project_settings.password_verify_workers,
+    max_queue=project_settings.password_verify_queue,
+)
+
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
@@ -16,3 +27,34 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
 
     return pwd_context.verify(plain_password, hashed_password)
+
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Run 'verify_password' in the bounded password executor so bcrypt never blocks the event loop.
+    Fails fast with 503 when too many verifications are already running or queued.
+
+    Args:
+        plain_password (str): The plain password provided by the user during login.
+        hashed_password (str): The hashed password stored in the database.
+
+    Returns:
+        bool: True if passwords match, False otherwise.
+    """
+
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+
+def hash_token(token: str) -> str:
+    """
+    Hash a high-entropy random token (ex: refresh token) with a fast digest before storing it.
+    bcrypt is not needed here because the token can't be brute forced like a password.
+
+    Args:
+        token (str): The plain token.
+
+    Returns:
+        str: The hex digest of the token.
+    """
+
+    return hashlib.sha256(token.encode()).hexdigest()
@@ -0,0 +1,50 @@
+import asyncio
+from typing import Awaitable, Callable, Generic, Hashable, TypeVar
+
+ResultType = TypeVar("ResultType")
+
+
+class SingleFlight(Generic[ResultType]):
+    def __init__(self):
+        """
+        Coalesce concurrent calls sharing a key: the first caller starts the call in a task,
+        every caller awaits it and gets the same result (or exception).
+        Only used from the event loop thread, so no lock is needed.
+        """
+
+        self.calls: dict[Hashable, asyncio.Future] = {}
+        self.coalesced = 0
+
+    async def run(
+        self, key: Hashable, func: Callable[[], Awaitable[ResultType]]
+    ) -> ResultType:
+        """
+        Run 'func' unless a call with the same key is already in flight, then await that one.
+
+        Args:
+            key (Hashable): What identifies identical calls.
+            func (Callable[[], Awaitable[ResultType]]): Builds the awaitable doing the work.
+
+        Returns:
+            ResultType: The call result.
+        """
+
+        task = self.calls.get(key)
+        if task is not None:
+            self.coalesced += 1
+        else:
+            # In its own task, the caller that started it going away doesn't cancel it
+            task = asyncio.ensure_future(func())
+            self.calls[key] = task
+            task.add_done_callback(lambda done: self.done(key, done))
+
+        # Shielded, a caller going away must not cancel the call the others wait for
+        return await asyncio.shield(task)
+
+    def done(self, key: Hashable, task: asyncio.Task) -> None:
+        if self.calls.get(key) is task:
+            del self.calls[key]
+
+        if not task.cancelled():
+            # Mark it retrieved, there may be no caller left to do it
+            task.exception()
@@ -1,32 +1,108 @@
 """Main"""
 
+import asyncio
+from contextlib import asynccontextmanager
 from typing import List
 
 from fastapi import FastAPI
 from fastapi.middleware import Middleware
 from fastapi.middleware.cors import CORSMiddleware
 
-from digital_folder.api.api import api_router
+from digital_folder.api.api import API_PREFIX, api_router
+from digital_folder.core.changes import ChangeListener
 from digital_folder.core.config import project_settings
+from digital_folder.core.metrics import flush_snapshots
+from digital_folder.core.middleware.admission import AdmissionMiddleware
+from digital_folder.core.middleware.compression import CompressionMiddleware
+from digital_folder.core.middleware.metrics import MetricsMiddleware
+from digital_folder.core.middleware.timing import ServerTimingMiddleware
+from digital_folder.core.responses import get_default_response_class
+from digital_folder.core.slow_queries import instrument_slow_queries
+from digital_folder.core.timing import instrument_engine
+from digital_folder.db.db import engine
+from digital_folder.db.service import apply_change, DbService
+from digital_folder.packages.Server.dto import ServerDTO
+from digital_folder.packages.User.dto import UserDTO
 
 
 def make_middleware() -> List[Middleware]:
     middlewares = []
 
+    # Outermost, so the total includes the time spent in the other middlewares
+    if project_settings.request_timing_enabled:
+        middlewares.append(
+            Middleware(
+                ServerTimingMiddleware,
+                header=project_settings.request_timing_header,
+            )
+        )
+
+    if project_settings.metrics_enabled:
+        middlewares.append(Middleware(MetricsMiddleware, prefix=API_PREFIX))
+
     if project_settings.backend_cors_origins:
-        middlewares = [
+        middlewares.append(
             Middleware(
                 CORSMiddleware,
                 allow_origins=project_settings.backend_cors_origins,
                 allow_credentials=True,
                 allow_methods=["*"],
                 allow_headers=["*"],
-            ),
-        ]
+            )
+        )
+
+    if project_settings.admission_enabled:
+        middlewares.append(
+            Middleware(
+                AdmissionMiddleware,
+                prefix=API_PREFIX,
+                route_limits=project_settings.admission_route_limits,
+                role_limits=project_settings.admission_role_limits,
+                max_queue=project_settings.admission_queue,
+                queue_timeout=project_settings.admission_queue_timeout,
+                exempt_routes=project_settings.admission_exempt_routes,
+            )
+        )
+
+    if project_settings.compression_enabled:
+        middlewares.append(
+            Middleware(
+                CompressionMiddleware,
+                minimum_size=project_settings.compression_minimum_size,
+                content_types=project_settings.compression_content_types,
+                level=project_settings.compression_level,
+                allow_brotli=project_settings.compression_brotli,
+            )
+        )
 
     return middlewares
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Warm process-wide caches before serving requests
+    with DbService() as db:
+        UserDTO(db).load_role_ids()
+
+    # Changes made by the other workers
+    listener = ChangeListener(on_change=apply_change)
+    if project_settings.changes_notify_enabled:
+        listener.start()
+
+    # Other workers serve the metrics of this one, see 'metrics_dir'
+    flush_task = None
+    if project_settings.metrics_enabled and project_settings.metrics_dir:
+        flush_task = asyncio.create_task(flush_snapshots(ServerDTO.collect))
+
+    yield
+
+    listener.stop()
+    if flush_task is not None:
+        # Writes a last snapshot on its way out
+        flush_task.cancel()
+        await asyncio.gather(flush_task, return_exceptions=True)
+
+
 def create_app() -> FastAPI:
     app = FastAPI(
         title=project_settings.project_name,
@@ -34,8 +110,16 @@ def create_app() -> FastAPI:
         docs_url="/" if project_settings.env.lower() != "prod" else None,
         middleware=make_middleware(),
         swagger_ui_parameters={"docExpansion": "none"},
+        lifespan=lifespan,
+        default_response_class=get_default_response_class(),
     )
 
-    app.include_router(api_router, prefix="/api")
+    app.include_router(api_router, prefix=API_PREFIX)
+
+    # Query timings and counts, see 'timed'
+    if project_settings.request_timing_enabled or project_settings.metrics_enabled:
+        instrument_engine(engine)
+    if project_settings.slow_query_enabled:
+        instrument_slow_queries(engine)
 
     return app
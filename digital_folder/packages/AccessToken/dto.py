@@ -1,20 +1,47 @@
+import hashlib
 from datetime import timedelta, datetime
 
 from fastapi.security import OAuth2PasswordBearer
-from jose import jwt
+from jose import jwt, JWTError
 
 from digital_folder.core.config import project_settings
+from digital_folder.helpers.cache import LRUCache
 from digital_folder.packages.AccessToken.schemas import TokenData
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/users/login")
 
+SELF_CONTAINED_CLAIMS = ("username", "role", "filter_id")
+
+# Token digest -> decoded payload, signatures are verified once per token per worker
+decoded_token_cache: LRUCache[dict] = LRUCache(maxsize=project_settings.jwt_cache_size)
+
 
 def create_access_token(token_data: TokenData) -> str:
+    """
+    Sign a JWT access token for the given user.
+
+    In "full" claims mode the role, username and filter_id are signed into the token
+    so requests can be authenticated without reading the users table.
+
+    Args:
+        token_data (TokenData): The user data to sign into the token.
+
+    Returns:
+        str: The encoded JWT access token.
+    """
+
     expire = datetime.now() + timedelta(
         minutes=project_settings.access_token_expires_in
     )
 
-    to_encode = {"id": token_data.id, "exp": expire}
+    to_encode = {
+        "id": token_data.id,
+        "exp": expire,
+        "ver": project_settings.jwt_token_version,
+    }
+
+    if project_settings.jwt_claims_mode == "full":
+        to_encode.update(token_data.model_dump(include=set(SELF_CONTAINED_CLAIMS)))
 
     encoded_jwt = jwt.encode(
         to_encode,
@@ -23,3 +50,48 @@ def create_access_token(token_data: TokenData) -> str:
     )
 
     return str(encoded_jwt)
+
+
+def decode_access_token(token: str) -> dict:
+    """
+    Verify and decode a JWT access token, rejecting tokens signed with a revoked version.
+    Decoded payloads are cached until the token expires.
+
+    Args:
+        token (str): The encoded JWT access token.
+
+    Returns:
+        dict: The token payload.
+    """
+
+    token_key = hashlib.sha256(token.encode()).digest()
+
+    payload = decoded_token_cache.get(token_key)
+    if payload is None:
+        payload = jwt.decode(
+            token,
+            project_settings.jwt_secret_key.get_secret_value(),
+            algorithms=[project_settings.jwt_algorithm],
+        )
+        decoded_token_cache.set(token_key, payload, expires_at=payload.get("exp"))
+
+    if payload.get("ver") != project_settings.jwt_token_version:
+        raise JWTError("Token version has been revoked.")
+
+    return payload
+
+
+def is_self_contained(payload: dict) -> bool:
+    """
+    Check if a decoded token carries every claim needed to build the user without a db lookup.
+
+    Args:
+        payload (dict): The decoded token payload.
+
+    Returns:
+        bool: True if the user can be built from the token alone.
+    """
+
+    return project_settings.jwt_claims_mode == "full" and all(
+        claim in payload for claim in SELF_CONTAINED_CLAIMS
+    )
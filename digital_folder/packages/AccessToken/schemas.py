@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 
@@ -5,6 +7,9 @@ class TokenData(BaseModel):
     """Token Data schema"""
 
     id: str
+    username: Optional[str] = None
+    role: Optional[str] = None
+    filter_id: Optional[str] = None
 
 
 class Token(BaseModel):
@@ -12,3 +17,4 @@ class Token(BaseModel):
 
     access_token: str
     token_type: str
+    refresh_token: Optional[str] = None
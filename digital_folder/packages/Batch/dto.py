@@ -0,0 +1,170 @@
+import asyncio
+from urllib.parse import urlsplit
+
+import orjson
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+from starlette.exceptions import HTTPException as StarletteHTTPException
+from starlette.types import Message, Scope
+
+from digital_folder.db.service import DbService
+from digital_folder.packages.Batch.schemas import BatchRequest, BatchSubRequest
+
+# Request headers passed to the sub-requests
+FORWARDED_HEADERS = {b"authorization", b"accept-language", b"user-agent"}
+# Sub-response headers returned with their body
+RETURNED_HEADERS = {"etag", "cache-control", "retry-after"}
+# Routers streaming until the client disconnects, they never complete inside a batch
+STREAMING_ROUTERS = {"/changes"}
+
+
+class BatchDTO:
+    def __init__(self, db: DbService, request: Request, prefix: str):
+        self.db = db
+        self.request = request
+        self.prefix = prefix
+
+    async def run(self, batch: BatchRequest) -> Response:
+        """
+        Run the sub-requests of a batch concurrently against the routes of the app.
+        They share the authenticated user and the db session of the batch request,
+        which is used by one sub-request at a time.
+
+        Args:
+            batch (BatchRequest): The sub-requests.
+
+        Returns:
+            Response: The BatchResponse, JSON sub-response bodies are embedded as is.
+        """
+
+        paths = [urlsplit(sub_request.path).path for sub_request in batch.requests]
+        if any(path.rstrip("/") == "/batch" for path in paths):
+            raise HTTPException(status_code=400, detail="Batches can't be nested.")
+        if any(
+            path.rstrip("/") == router or path.startswith(f"{router}/")
+            for path in paths
+            for router in STREAMING_ROUTERS
+        ):
+            raise HTTPException(
+                status_code=400, detail="Streaming routes can't be batched."
+            )
+
+        responses = await asyncio.gather(
+            *[
+                self.run_sub_request(index, sub_request)
+                for index, sub_request in enumerate(batch.requests)
+            ]
+        )
+
+        return Response(
+            content=b'{"responses":[' + b",".join(responses) + b"]}",
+            media_type="application/json",
+        )
+
+    async def run_sub_request(self, index: int, sub_request: BatchSubRequest) -> bytes:
+        """
+        Dispatch a sub-request to the app router, below the middlewares.
+
+        Args:
+            index (int): The sub-request index, its default ID.
+            sub_request (BatchSubRequest): The sub-request.
+
+        Returns:
+            bytes: The serialized BatchSubResponse.
+        """
+
+        url = urlsplit(sub_request.path)
+        scope: Scope = {
+            key: self.request.scope[key]
+            for key in (
+                "type",
+                "asgi",
+                "http_version",
+                "scheme",
+                "server",
+                "client",
+                "root_path",
+                "app",
+                "starlette.exception_handlers",
+            )
+            if key in self.request.scope
+        }
+        scope.update(
+            {
+                "method": sub_request.method,
+                "path": f"{self.prefix}{url.path}",
+                "raw_path": f"{self.prefix}{url.path}".encode(),
+                "query_string": url.query.encode(),
+                "headers": [
+                    (key, value)
+                    for key, value in self.request.scope["headers"]
+                    if key in FORWARDED_HEADERS
+                ],
+                # Picked up by the auth dependencies instead of a new user lookup and session
+                "state": {"batch_db": self.db},
+            }
+        )
+
+        start: Message = {}
+        body = bytearray()
+        received = False
+        completed = asyncio.Event()
+
+        async def receive() -> Message:
+            nonlocal received
+            if not received:
+                received = True
+                return {"type": "http.request", "body": b"", "more_body": False}
+
+            # Responses listening for a disconnect wait here until they are sent
+            await completed.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message: Message) -> None:
+            nonlocal start
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+                if not message.get("more_body", False):
+                    completed.set()
+
+        try:
+            await self.request.app.router(scope, receive, send)
+            status = start["status"]
+            response_headers = {
+                key.decode().lower(): value.decode()
+                for key, value in start.get("headers", [])
+            }
+            headers = {
+                key: value
+                for key, value in response_headers.items()
+                if key in RETURNED_HEADERS
+            }
+            content_type = response_headers.get("content-type", "")
+        except StarletteHTTPException as exc:
+            # Raised outside of a route, ex: 404 for an unknown path
+            status, headers, content_type = exc.status_code, {}, "application/json"
+            body = bytearray(orjson.dumps({"detail": exc.detail}))
+        except Exception:
+            status, headers, content_type = 500, {}, "application/json"
+            body = bytearray(b'{"detail":"Internal Server Error"}')
+
+        meta = orjson.dumps(
+            {
+                "id": sub_request.id if sub_request.id is not None else str(index),
+                "status": status,
+                "headers": headers,
+            }
+        )
+
+        if not body:
+            content = b"null"
+        elif content_type.split(";")[0].strip() == "application/json":
+            # Already JSON, embed it without decoding it
+            content = bytes(body)
+        else:
+            # Ex: the text metrics exposition, embedded as a JSON string
+            content = orjson.dumps(body.decode(errors="replace"))
+
+        return meta[:-1] + b',"body":' + content + b"}"
@@ -0,0 +1,39 @@
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import Response
+
+from digital_folder.core.dependencies import get_db_validate_user
+from digital_folder.core.responses import HeadersRoute
+from digital_folder.db.service import DbService
+from digital_folder.packages.Batch.dto import BatchDTO
+from digital_folder.packages.Batch.schemas import BatchRequest, BatchResponse
+
+batch_router = APIRouter(route_class=HeadersRoute)
+
+
+class BatchRouter:
+    def __init__(self, router: APIRouter):
+        self.model_dto = BatchDTO
+        self.router = router
+        self.router.add_api_route(
+            "",
+            self.batch,
+            methods=["POST"],
+            response_model=None,
+            responses={200: {"model": BatchResponse}},
+        )
+
+    async def batch(
+        self,
+        request: Request,
+        batch: BatchRequest,
+        db: DbService = Depends(get_db_validate_user),
+    ) -> Response:
+        """Run several GET requests in one round trip"""
+
+        # Sub-request paths are relative to the prefix the api router is mounted on
+        prefix = request.url.path.removesuffix("/batch")
+
+        return await self.model_dto(db, request, prefix).run(batch)
+
+
+BatchRouter(batch_router)
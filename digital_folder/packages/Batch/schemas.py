@@ -0,0 +1,39 @@
+from typing import List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from digital_folder.core.config import project_settings
+
+
+class BatchSubRequest(BaseModel):
+    """Batch Sub Request schema"""
+
+    # Echoed back to match the responses, defaults to the request index
+    id: Optional[str] = None
+    method: Literal["GET"] = "GET"
+    # Path under /api with its query string ex: /projects/list?search=web
+    path: str
+
+
+class BatchRequest(BaseModel):
+    """Batch Request schema"""
+
+    requests: List[BatchSubRequest] = Field(
+        ..., min_length=1, max_length=project_settings.batch_max_requests
+    )
+
+
+class BatchSubResponse(BaseModel):
+    """Batch Sub Response schema"""
+
+    id: str
+    status: int
+    headers: dict[str, str]
+    # The sub-request JSON response, a string for other content types, null if it had no body
+    body: Optional[object] = None
+
+
+class BatchResponse(BaseModel):
+    """Batch Response schema"""
+
+    responses: List[BatchSubResponse]
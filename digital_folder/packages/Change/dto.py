@@ -0,0 +1,64 @@
+import asyncio
+from typing import AsyncIterator
+
+import orjson
+
+from digital_folder.core.changes import change_bus, RESYNC
+from digital_folder.core.config import project_settings
+from digital_folder.packages.Change.schemas import ChangeEvent
+from digital_folder.packages.User.schemas import UserDb, UserRole
+
+
+class ChangeDTO:
+    def __init__(self, user: UserDb):
+        self.user = user
+
+    async def stream(self) -> AsyncIterator[bytes]:
+        """
+        Stream the change events in the user scope as server-sent events,
+        until the client disconnects.
+
+        Events:
+            change: A ChangeEvent, without its owner.
+            resync: The stream fell behind and lost events, every list should be fetched again.
+
+        Returns:
+            AsyncIterator[bytes]: The event stream.
+        """
+
+        subscription = change_bus.subscribe()
+        try:
+            retry = int(project_settings.changes_client_retry * 1000)
+            yield f"retry: {retry}\n\n".encode()
+
+            while True:
+                try:
+                    event = await asyncio.wait_for(
+                        subscription.get(), project_settings.changes_keepalive
+                    )
+                except asyncio.TimeoutError:
+                    # Keeps proxies from closing an idle connection
+                    yield b": ping\n\n"
+                    continue
+
+                if event == RESYNC:
+                    yield b"event: resync\ndata: {}\n\n"
+                elif self.in_scope(event):
+                    data = orjson.dumps(
+                        event.model_dump(mode="json", exclude={"owner"})
+                    )
+                    yield b"event: change\ndata: " + data + b"\n\n"
+        finally:
+            change_bus.unsubscribe(subscription)
+
+    def in_scope(self, event: ChangeEvent) -> bool:
+        """Same scope as the list queries, see 'DbService.get_all'"""
+
+        # Same roles as the ticket routes, see 'validate_role'
+        if event.entity == "tickets" and self.user.role not in [
+            UserRole.ADMIN,
+            UserRole.USER,
+        ]:
+            return False
+
+        return not self.user.filter_id or event.owner == self.user.filter_id
@@ -0,0 +1,34 @@
+from fastapi import APIRouter, Depends
+from fastapi.responses import StreamingResponse
+
+from digital_folder.core.dependencies import validate_user
+from digital_folder.core.responses import HeadersRoute
+from digital_folder.packages.Change.dto import ChangeDTO
+from digital_folder.packages.User.schemas import UserDb
+
+change_router = APIRouter(route_class=HeadersRoute)
+
+
+class ChangeRouter:
+    def __init__(self, router: APIRouter):
+        self.model_dto = ChangeDTO
+        self.router = router
+        self.router.add_api_route(
+            "/stream",
+            self.stream,
+            methods=["GET"],
+            response_class=StreamingResponse,
+            responses={200: {"content": {"text/event-stream": {}}}},
+        )
+
+    async def stream(self, user: UserDb = Depends(validate_user)) -> StreamingResponse:
+        """Stream the created, updated and deleted projects, tags, groups and tickets"""
+
+        return StreamingResponse(
+            self.model_dto(user).stream(),
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+
+ChangeRouter(change_router)
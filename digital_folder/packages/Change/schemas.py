@@ -0,0 +1,23 @@
+from enum import Enum
+from typing import Optional
+from uuid import UUID
+
+from pydantic import BaseModel
+
+
+class ChangeOp(str, Enum):
+    CREATE = "create"
+    UPDATE = "update"
+    DELETE = "delete"
+
+
+class ChangeEvent(BaseModel):
+    """Change Event schema"""
+
+    entity: str
+    id: UUID
+    op: ChangeOp
+    # Version of the change, a '/sync?since=' cursor
+    version: int = 0
+    # User the changed row belongs to, streams only send a user the changes in its scope
+    owner: Optional[UUID] = None
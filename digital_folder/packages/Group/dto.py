@@ -2,9 +2,15 @@ from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy.orm import selectinload
 
 from digital_folder.core.auth import validate_ownership, validate_unique
-from digital_folder.core.pagination.types import PaginatedResponse, QueryParams
+from digital_folder.core.fragments import fragment_cache, fragment_key
+from digital_folder.core.pagination.types import (
+    Fieldset,
+    PaginatedResponse,
+    QueryParams,
+)
 from digital_folder.db.models import Group
 from digital_folder.db.service import DbService
 from digital_folder.packages.Group.schemas import (
@@ -16,28 +22,40 @@ from digital_folder.packages.Group.schemas import (
 
 
 class GroupDTO:
+    # Collections the read responses are built from, see 'check_etag'
+    COLLECTIONS = ("groups", "tags")
+
+    # Output field -> relation it comes from
+    RELATION_FIELDS = {"has_tags": "tags", "tags": "tags"}
+
     def __init__(self, db: DbService):
         self.db = db
 
-    def list(self, params: QueryParams) -> PaginatedResponse:
+    def list(self, params: QueryParams) -> PaginatedResponse[GroupOut]:
         """
         Retrieve groups from the database.
 
         Args:
             params (QueryParams): Params to select what data to retrieve.
-            Can include filters, items per page, page, search and sort by.
+            Can include filters, items per page, page, search, sort by and a fieldset.
 
         Returns:
-            PaginatedResponse: Contains a list of groups and the count.
+            PaginatedResponse[GroupOut]: Contains a list of groups and the count.
         """
 
-        groups, count = self.db.get_all(Group, params)
+        options = DbService.load_options(
+            Group, params.fieldset, {"tags": [selectinload(Group.tags)]}
+        )
+
+        groups, count = self.db.get_all(Group, params, options)
         parsed_groups = []
         for group in groups:
-            group = self.group_parser(group, True)
+            group = self.group_parser(group, True, params.fieldset)
             parsed_groups.append(group)
 
-        return PaginatedResponse(items=parsed_groups, count=count)
+        return PaginatedResponse[GroupOut].model_construct(
+            items=parsed_groups, count=count
+        )
 
     def get_by_id(self, group_id: UUID) -> GroupOut:
         """
@@ -115,54 +133,71 @@ class GroupDTO:
         self.db.delete(Group, group.id)
 
     def group_parser(
-        self, group: Group, include_tags: Optional[bool] = False
+        self,
+        group: Group,
+        include_tags: Optional[bool] = False,
+        fieldset: Optional[Fieldset] = None,
     ) -> Union[GroupOut, GroupWithoutTagsOut]:
         """
         This function takes group data and turns it into a GroupOut object.
+        Built with 'model_construct' since the values come from typed db columns.
+        Full groups are memoized in the fragment cache, see 'TagDTO.tag_parser'.
 
         Args:
             group (Group): The group data.
             include_tags (Optional[bool]): Flag to return group with or without tags.
+            fieldset (Optional[Fieldset]): Fields and relations to return when including tags. Defaults to all.
 
         Returns:
             GroupOut: The parsed group object.
         """
 
+        fieldset = fieldset or Fieldset()
+
+        # Full fragments are shared by every request until tags or groups change
+        fragment = fieldset.selects_all()
+        if fragment:
+            key = fragment_key(self.db, "group", group.id, include_tags)
+            parsed = fragment_cache.get(key)
+            if parsed is not None:
+                return parsed
+
         if include_tags:
             from digital_folder.packages.Tag.dto import TagDTO
 
             tag_dto = TagDTO(self.db)
 
             parsed_group = {
-                "id": group.id,
-                "name": group.name or None,
-                "has_tags": True if group.tags else False,
-                "tags": (
+                "id": lambda: group.id,
+                "name": lambda: group.name or None,
+                "has_tags": lambda: True if group.tags else False,
+                "tags": lambda: (
                     [tag_dto.tag_parser(tag, False) for tag in group.tags]
                     if group.tags
                     else []
                 ),
+                "created_by": lambda: group.created_by,
+            }
+
+            parsed = GroupOut.model_construct(
+                **fieldset.pick(parsed_group, self.RELATION_FIELDS)
+            )
+        else:
+            parsed_group = {
+                "id": group.id,
+                "name": group.name or None,
+                "has_tags": True if group.tags else False,
                 "created_by": group.created_by,
             }
 
-            return GroupOut(
+            parsed = GroupWithoutTagsOut.model_construct(
                 id=parsed_group["id"],
                 name=parsed_group["name"],
                 has_tags=parsed_group["has_tags"],
-                tags=parsed_group["tags"],
                 created_by=parsed_group["created_by"],
             )
 
-        parsed_group = {
-            "id": group.id,
-            "name": group.name or None,
-            "has_tags": True if group.tags else False,
-            "created_by": group.created_by,
-        }
-
-        return GroupWithoutTagsOut(
-            id=parsed_group["id"],
-            name=parsed_group["name"],
-            has_tags=parsed_group["has_tags"],
-            created_by=parsed_group["created_by"],
-        )
+        if fragment:
+            fragment_cache.set(key, parsed)
+
+        return parsed
@@ -1,11 +1,15 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 
 from digital_folder.core.dependencies import get_db_validate_role, get_db_validate_user
+from digital_folder.core.etag import check_etag
 from digital_folder.core.pagination.types import PaginatedResponse
+from digital_folder.core.response_cache import cached_response, get_cache_policy
+from digital_folder.core.responses import HeadersRoute, trusted_response
 from digital_folder.core.pagination.utils import query_params_parser
+from digital_folder.db.db import db_executor
 from digital_folder.db.service import DbService
 from digital_folder.packages.Group.dto import GroupDTO
 from digital_folder.packages.Group.schemas import (
@@ -14,20 +18,27 @@ from digital_folder.packages.Group.schemas import (
     GroupOut,
 )
 
-group_router = APIRouter()
+group_router = APIRouter(route_class=HeadersRoute)
 
 
 class GroupRouter:
     def __init__(self, router: APIRouter):
         self.model_dto = GroupDTO
+        self.cache_policy = get_cache_policy("groups")
         self.router = router
-        self.router.add_api_route("/list", self.list, methods=["GET"])
+        self.router.add_api_route(
+            "/list",
+            self.list,
+            methods=["GET"],
+            **trusted_response(PaginatedResponse[GroupOut]),
+        )
         self.router.add_api_route("/create", self.create, methods=["POST"])
         self.router.add_api_route("/patch/{group_id}", self.patch, methods=["PATCH"])
         self.router.add_api_route("/delete/{group_id}", self.delete, methods=["DELETE"])
 
     async def list(
         self,
+        request: Request,
         filters: Optional[str] = Query(
             None, description="""Has tags? ex: {"has_tags":true}"""
         ),
@@ -45,10 +56,18 @@ class GroupRouter:
             description="""JSON string like [{"key":"name","order":"desc"}]""",
             alias="sortBy",
         ),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return ex: name"
+        ),
+        include: Optional[str] = Query(
+            None,
+            description="Comma-separated relations to expand ex: tags (also has_tags)",
+        ),
         db: DbService = Depends(get_db_validate_user),
-    ) -> PaginatedResponse:
+    ) -> PaginatedResponse[GroupOut]:
         """List groups"""
 
+        check_etag(request, db, self.model_dto.COLLECTIONS)
         params = query_params_parser(
             db=db,
             filters=filters,
@@ -56,9 +75,18 @@ class GroupRouter:
             page=page,
             search=search,
             sort_by=sort_by,
+            fields=fields,
+            include=include,
         )
 
-        return self.model_dto(db).list(params)
+        return await cached_response(
+            request,
+            db,
+            self.model_dto.COLLECTIONS,
+            params,
+            lambda db: self.model_dto(db).list(params),
+            self.cache_policy,
+        )
 
     async def create(
         self,
@@ -67,7 +95,7 @@ class GroupRouter:
     ) -> GroupOut:
         """Create group"""
 
-        return self.model_dto(db).create(group)
+        return await db_executor.run(self.model_dto(db).create, group)
 
     async def patch(
         self,
@@ -77,7 +105,7 @@ class GroupRouter:
     ) -> GroupOut:
         """Edit group"""
 
-        return self.model_dto(db).edit_by_id(group_id, group)
+        return await db_executor.run(self.model_dto(db).edit_by_id, group_id, group)
 
     async def delete(
         self,
@@ -86,7 +114,7 @@ class GroupRouter:
     ) -> None:
         """Delete group"""
 
-        return self.model_dto(db).delete_by_id(group_id)
+        return await db_executor.run(self.model_dto(db).delete_by_id, group_id)
 
 
 GroupRouter(group_router)
@@ -1,10 +1,16 @@
+from typing import Any, List, Optional
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy.orm import selectinload
 
 from digital_folder.core.auth import validate_ownership, validate_unique
-from digital_folder.core.pagination.types import PaginatedResponse, QueryParams
-from digital_folder.db.models import Project, Tag
+from digital_folder.core.pagination.types import (
+    Fieldset,
+    PaginatedResponse,
+    QueryParams,
+)
+from digital_folder.db.models import Group, Project, Tag
 from digital_folder.db.service import DbService
 from digital_folder.packages.Project.schemas import (
     ProjectCreate,
@@ -18,50 +24,66 @@ from digital_folder.supabase.storage import SupabaseDTO
 
 
 class ProjectDTO:
+    # Collections the read responses are built from, see 'check_etag'
+    COLLECTIONS = ("projects", "project_urls", "tags", "groups")
+
+    # Output field -> relation it comes from
+    RELATION_FIELDS = {"urls": "urls", "tags": "tags", "tag_ids": "tags"}
+
     def __init__(self, db: DbService):
         self.db = db
+        self.tag_dto = TagDTO(db)
         self.supabase_storage_config = SupabaseStorageConfig(
             bucket=self.db.user.env, folder="projects"
         )
 
-    def list(self, params: QueryParams) -> PaginatedResponse:
+    def list(self, params: QueryParams) -> PaginatedResponse[ProjectOut]:
         """
         Retrieve projects from the database.
 
         Args:
             params (QueryParams): Params to select what data to retrieve.
-            Can include filters, items per page, page, search and sort by.
+            Can include filters, items per page, page, search, sort by and a fieldset.
 
         Returns:
-            PaginatedResponse: Contains a list of projects and the count.
+            PaginatedResponse[ProjectOut]: Contains a list of projects and the count.
         """
 
-        projects, count = self.db.get_all(Project, params)
+        projects, count = self.db.get_all(
+            Project, params, self.load_options(params.fieldset)
+        )
         parsed_projects = []
         for project in projects:
-            project = self.project_parser(project)
+            project = self.project_parser(project, params.fieldset)
             parsed_projects.append(project)
 
-        return PaginatedResponse(items=parsed_projects, count=count)
+        return PaginatedResponse[ProjectOut].model_construct(
+            items=parsed_projects, count=count
+        )
 
-    def get_by_id(self, project_id: UUID) -> ProjectOut:
+    def get_by_id(
+        self, project_id: UUID, fieldset: Optional[Fieldset] = None
+    ) -> ProjectOut:
         """
         Retrieve a project by its ID.
 
         Args:
             project_id (UUID): The project ID.
+            fieldset (Optional[Fieldset]): Fields and relations to return. Defaults to all.
 
         Returns:
             ProjectOut: The project data.
         """
 
-        project = self.db.get_by_id(Project, project_id)
+        fieldset = fieldset or Fieldset()
+
+        project = self.db.get_by_id(Project, project_id, self.load_options(fieldset))
         if not project:
             raise HTTPException(
                 status_code=400, detail=f"Project {project_id} not found."
             )
 
-        return self.project_parser(project)
+        return self.project_parser(project, fieldset)
 
     def create(self, project_data: ProjectCreate) -> ProjectOut:
         """
@@ -77,7 +99,7 @@ class ProjectDTO:
         """
 
         if project_data.tag_ids:
-            validate_ownership(TagDTO(self.db), project_data.tag_ids, True)
+            validate_ownership(self.tag_dto, project_data.tag_ids, True)
         validate_unique(self.db, Project, project_data.name)
 
         project_dict = project_data.dict(exclude={"tags", "tag_ids", "urls"})
@@ -114,7 +136,7 @@ class ProjectDTO:
 
         validate_ownership(self, [project_id])
         if project_data.tag_ids:
-            validate_ownership(TagDTO(self.db), project_data.tag_ids, True)
+            validate_ownership(self.tag_dto, project_data.tag_ids, True)
         if project_data.name:
             validate_unique(self.db, Project, project_data.name)
 
@@ -170,48 +192,75 @@ class ProjectDTO:
 
         self.db.delete(Project, project_id)
 
-    def project_parser(self, project: Project) -> ProjectOut:
+    @staticmethod
+    def load_options(fieldset: Fieldset) -> List[Any]:
+        """
+        Loader options that eager load only the columns and relations in the fieldset.
+
+        Args:
+            fieldset (Fieldset): Fields and relations to return.
+
+        Returns:
+            List[Any]: SQLAlchemy loader options.
+        """
+
+        return DbService.load_options(
+            Project,
+            fieldset,
+            {
+                "tags": [selectinload(Project.tags)],
+                "group": [
+                    selectinload(Project.tags)
+                    .selectinload(Tag.group)
+                    .selectinload(Group.tags)
+                ],
+                "urls": [selectinload(Project.urls)],
+            },
+        )
+
+    def project_parser(
+        self, project: Project, fieldset: Optional[Fieldset] = None
+    ) -> ProjectOut:
         """
         This function takes project data and turns it into a ProjectOut object.
+        Skips validation ('model_construct'), nested tags and urls are already parsed objects.
+        Fields left out of the fieldset are never read, so they are neither loaded nor returned.
 
         Args:
             project (Project): The project data.
+            fieldset (Optional[Fieldset]): Fields and relations to return. Defaults to all.
 
         Returns:
             ProjectOut: The parsed project data.
         """
 
-        tag_dto = TagDTO(self.db) if project.tags else None
-        url_dto = ProjectUrlDTO(self.db) if project.urls else None
+        fieldset = fieldset or Fieldset()
 
         parsed_project = {
-            "id": project.id,
-            "name": project.name,
-            "urls": (
-                [url_dto.url_parser(url) for url in project.urls]
+            "id": lambda: project.id,
+            "name": lambda: project.name,
+            "urls": lambda: (
+                [ProjectUrlDTO.url_parser(url) for url in project.urls]
                 if project.urls
                 else []
             ),
-            "introduction": project.introduction or None,
-            "description": project.description or None,
-            "tags": (
-                [tag_dto.tag_parser(tag) for tag in project.tags]
+            "introduction": lambda: project.introduction or None,
+            "description": lambda: project.description or None,
+            "tags": lambda: (
+                [
+                    self.tag_dto.tag_parser(tag, fieldset.includes("group"))
+                    for tag in project.tags
+                ]
                 if project.tags
                 else []
             ),
-            "tag_ids": [tag.id for tag in project.tags] if project.tags else [],
-            "images": project.images or None,
-            "created_by": project.created_by,
+            "tag_ids": lambda: (
+                [tag.id for tag in project.tags] if project.tags else []
+            ),
+            "images": lambda: project.images or None,
+            "created_by": lambda: project.created_by,
         }
 
-        return ProjectOut(
-            id=parsed_project["id"],
-            name=parsed_project["name"],
-            urls=parsed_project["urls"],
-            introduction=parsed_project["introduction"],
-            description=parsed_project["description"],
-            tags=parsed_project["tags"],
-            tag_ids=parsed_project["tag_ids"],
-            images=parsed_project["images"],
-            created_by=parsed_project["created_by"],
+        return ProjectOut.model_construct(
+            **fieldset.pick(parsed_project, self.RELATION_FIELDS)
         )
@@ -1,12 +1,23 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Request
 
 from digital_folder.core.dependencies import get_db_validate_role, get_db_validate_user
+from digital_folder.core.etag import check_etag
+from digital_folder.core.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    idempotent_response,
+)
 from digital_folder.core.pagination.types import PaginatedResponse
-from digital_folder.core.pagination.utils import query_params_parser
-from digital_folder.db.service import DbService
+from digital_folder.core.response_cache import cached_response, get_cache_policy
+from digital_folder.core.responses import HeadersRoute, trusted_response
+from digital_folder.core.pagination.utils import (
+    fieldset_parser,
+    query_params_parser,
+)
+from digital_folder.db.db import db_executor
+from digital_folder.db.service import DbService, run_in_session
 from digital_folder.packages.Project.dto import ProjectDTO
 from digital_folder.packages.Project.schemas import (
     ProjectCreate,
@@ -14,56 +25,125 @@ from digital_folder.packages.Project.schemas import (
     ProjectOut,
 )
 
-project_router = APIRouter()
+project_router = APIRouter(route_class=HeadersRoute)
 
 
 class ProjectRouter:
     def __init__(self, router: APIRouter):
         self.model_dto = ProjectDTO
+        self.cache_policy = get_cache_policy("projects")
         self.router = router
-        self.router.add_api_route("/list", self.list, methods=["GET"])
         self.router.add_api_route(
-            "/project/{project_id}", self.get_by_id, methods=["GET"]
+            "/list",
+            self.list,
+            methods=["GET"],
+            **trusted_response(PaginatedResponse[ProjectOut]),
+        )
+        self.router.add_api_route(
+            "/project/{project_id}",
+            self.get_by_id,
+            methods=["GET"],
+            **trusted_response(ProjectOut),
+        )
+        self.router.add_api_route(
+            "/create",
+            self.create,
+            methods=["POST"],
+            **trusted_response(ProjectOut),
+        )
+        self.router.add_api_route(
+            "/patch/{project_id}",
+            self.patch,
+            methods=["PATCH"],
+            **trusted_response(ProjectOut),
         )
-        self.router.add_api_route("/create", self.create, methods=["POST"])
-        self.router.add_api_route("/patch/{project_id}", self.patch, methods=["PATCH"])
         self.router.add_api_route(
             "/delete/{project_id}", self.delete, methods=["DELETE"]
         )
 
     async def list(
         self,
+        request: Request,
         filters: Optional[str] = Query(None, description="Comma-separated tag IDs"),
         search: Optional[str] = Query(None, description="Search string"),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return ex: name,images"
+        ),
+        include: Optional[str] = Query(
+            None, description="Comma-separated relations to expand ex: tags,urls,group"
+        ),
         db: DbService = Depends(get_db_validate_user),
-    ) -> PaginatedResponse:
+    ) -> PaginatedResponse[ProjectOut]:
         """List projects"""
 
+        check_etag(request, db, self.model_dto.COLLECTIONS)
         params = query_params_parser(
             db=db,
             filters=filters,
             search=search,
+            fields=fields,
+            include=include,
         )
 
-        return self.model_dto(db).list(params)
+        return await cached_response(
+            request,
+            db,
+            self.model_dto.COLLECTIONS,
+            params,
+            lambda db: self.model_dto(db).list(params),
+            self.cache_policy,
+        )
 
     async def get_by_id(
         self,
+        request: Request,
         project_id: UUID,
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return ex: name,images"
+        ),
+        include: Optional[str] = Query(
+            None, description="Comma-separated relations to expand ex: tags,urls,group"
+        ),
         db: DbService = Depends(get_db_validate_user),
     ) -> ProjectOut:
         """Get project by id"""
 
-        return self.model_dto(db).get_by_id(project_id)
+        check_etag(request, db, self.model_dto.COLLECTIONS)
+        fieldset = fieldset_parser(fields, include)
+
+        return await cached_response(
+            request,
+            db,
+            self.model_dto.COLLECTIONS,
+            fieldset,
+            lambda db: self.model_dto(db).get_by_id(project_id, fieldset),
+            self.cache_policy,
+        )
 
     async def create(
         self,
+        request: Request,
         project: ProjectCreate,
+        idempotency_key: Optional[str] = Header(
+            None,
+            alias=IDEMPOTENCY_KEY_HEADER,
+            max_length=255,
+            description="Unique per request, retries with the same key replay the first response",
+        ),
         db: DbService = Depends(get_db_validate_role),
     ) -> ProjectOut:
         """Create project"""
 
-        return self.model_dto(db).create(project)
+        return await idempotent_response(
+            request,
+            db.user,
+            idempotency_key,
+            project.model_dump(mode="json"),
+            # Kept running if the request is cancelled, so not with the request session
+            lambda: db_executor.run(
+                run_in_session, db.user, lambda db: self.model_dto(db).create(project)
+            ),
+        )
 
     async def patch(
         self,
@@ -73,7 +153,7 @@ class ProjectRouter:
     ) -> ProjectOut:
         """Edit project"""
 
-        return self.model_dto(db).edit_by_id(project_id, project)
+        return await db_executor.run(self.model_dto(db).edit_by_id, project_id, project)
 
     async def delete(
         self,
@@ -82,7 +162,7 @@ class ProjectRouter:
     ) -> None:
         """Delete project"""
 
-        return self.model_dto(db).delete_by_id(project_id)
+        return await db_executor.run(self.model_dto(db).delete_by_id, project_id)
 
 
 ProjectRouter(project_router)
@@ -41,6 +41,7 @@ class ProjectUrlDTO:
     def url_parser(url: ProjectUrl) -> ProjectUrlOut:
         """
         This function takes project url data and turns it into a ProjectUrlOut object.
+        Read straight from the row attributes, only the 'url' field needs real validation (HttpUrl).
 
         Args:
             url (ProjectUrl): The project url data.
@@ -49,14 +50,4 @@ class ProjectUrlDTO:
             ProjectUrlOut: The parsed project url data.
         """
 
-        parsed_url = {
-            "id": url.id,
-            "name": url.name,
-            "url": url.url,
-        }
-
-        return ProjectUrlOut(
-            id=parsed_url["id"],
-            name=parsed_url["name"],
-            url=parsed_url["url"],
-        )
+        return ProjectUrlOut.model_validate(url, from_attributes=True)
@@ -0,0 +1 @@
+"""Refresh Token module"""
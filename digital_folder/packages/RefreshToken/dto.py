@@ -0,0 +1,79 @@
+import secrets
+from datetime import datetime, timedelta, timezone
+from uuid import UUID
+
+from fastapi import HTTPException
+from sqlalchemy import delete
+
+from digital_folder.core.config import project_settings
+from digital_folder.db.models import RefreshToken, User
+from digital_folder.db.service import DbService
+from digital_folder.helpers.secrets import hash_token
+
+
+class RefreshTokenDTO:
+    def __init__(self, db: DbService):
+        self.db = db
+
+    def create(self, user_id: UUID) -> str:
+        """
+        Create a new refresh token for a user. Only its hash is stored in the database.
+        Expired refresh tokens of the same user are cleaned up.
+
+        Args:
+            user_id (UUID): The user ID.
+
+        Returns:
+            str: The plain refresh token, to be handed to the client.
+        """
+
+        now = datetime.now(timezone.utc)
+        # Committed with the new token by 'create'
+        self.db.db.execute(
+            delete(RefreshToken).where(
+                RefreshToken.user_id == user_id, RefreshToken.expires_at <= now
+            )
+        )
+
+        refresh_token = secrets.token_urlsafe(48)
+        self.db.create(
+            RefreshToken,
+            {
+                "token_hash": hash_token(refresh_token),
+                "user_id": user_id,
+                "expires_at": now
+                + timedelta(minutes=project_settings.refresh_token_expires_in),
+                "token_version": project_settings.jwt_token_version,
+            },
+        )
+
+        return refresh_token
+
+    def rotate(self, refresh_token: str) -> tuple[User, str]:
+        """
+        Consume a refresh token and issue a new one in its place.
+        A refresh token can only be used once, even by concurrent refreshes,
+        and is revoked by a 'jwt_token_version' bump like access tokens.
+
+        Args:
+            refresh_token (str): The plain refresh token.
+
+        Returns:
+            tuple[User, str]: The token owner. The new plain refresh token.
+        """
+
+        refresh = self.db.consume_by_field(
+            RefreshToken, RefreshToken.token_hash, hash_token(refresh_token)
+        )
+        if not refresh:
+            raise HTTPException(status_code=400, detail="Invalid refresh token.")
+
+        if refresh.token_version != project_settings.jwt_token_version:
+            raise HTTPException(status_code=400, detail="Refresh token was revoked.")
+
+        if refresh.expires_at <= datetime.now(timezone.utc):
+            raise HTTPException(status_code=400, detail="Refresh token has expired.")
+
+        user = self.db.get_by_id(User, refresh.user_id)
+
+        return user, self.create(user.id)
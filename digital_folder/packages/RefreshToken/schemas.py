@@ -0,0 +1,7 @@
+from pydantic import BaseModel
+
+
+class RefreshTokenIn(BaseModel):
+    """Refresh Token In schema"""
+
+    refresh_token: str
@@ -0,0 +1,74 @@
+from typing import List, Optional
+
+from digital_folder.core.fragments import fragment_cache
+from digital_folder.core.metrics import (
+    cache_entries,
+    cache_hit_ratio,
+    cache_hits,
+    cache_misses,
+    coalesced_requests,
+    db_pool_connections,
+    executor_pending,
+    scrape,
+)
+from digital_folder.core.response_cache import request_coalescer, response_cache
+from digital_folder.core.slow_queries import slow_query_log, SlowQuery
+from digital_folder.db.db import db_executor, engine
+from digital_folder.helpers.cache import CacheStats
+from digital_folder.helpers.secrets import password_executor
+from digital_folder.packages.AccessToken.dto import decoded_token_cache
+from digital_folder.packages.User.cache import role_user_id_cache
+
+
+class ServerDTO:
+    @staticmethod
+    def collect() -> None:
+        """Refresh the metrics read from the pool, the executors and the caches"""
+
+        pool = engine.pool
+        db_pool_connections.set(pool.size(), "size")
+        db_pool_connections.set(pool.checkedout(), "checked_out")
+        db_pool_connections.set(pool.checkedin(), "checked_in")
+        db_pool_connections.set(max(pool.overflow(), 0), "overflow")
+
+        for executor in (db_executor, password_executor):
+            executor_pending.set(executor.pending, executor.name)
+
+        caches: dict[str, Optional[CacheStats]] = {
+            "response": response_cache.stats(),
+            "fragment": fragment_cache.stats(),
+            "jwt": decoded_token_cache.stats(),
+            "role": role_user_id_cache.stats(),
+        }
+        for cache, stats in caches.items():
+            if stats is None:
+                continue
+
+            cache_hits.set(stats.hits, cache)
+            cache_misses.set(stats.misses, cache)
+            cache_entries.set(stats.size, cache)
+            lookups = stats.hits + stats.misses
+            cache_hit_ratio.set(stats.hits / lookups if lookups else 0, cache)
+
+        coalesced_requests.set(request_coalescer.coalesced)
+
+    def metrics(self) -> str:
+        """
+        Render the metrics in the Prometheus text exposition format.
+
+        Returns:
+            str: The exposition text.
+        """
+
+        return scrape(self.collect)
+
+    @staticmethod
+    def slow_queries() -> List[SlowQuery]:
+        """
+        Get the slowest statements of the slow query window.
+
+        Returns:
+            List[SlowQuery]: By total time over the threshold, desc.
+        """
+
+        return slow_query_log.top()
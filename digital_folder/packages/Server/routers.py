@@ -1,14 +1,40 @@
-from fastapi import APIRouter
+import secrets
+from typing import List, Optional
 
+from fastapi import APIRouter, Depends, Header, HTTPException
+from fastapi.responses import PlainTextResponse
+
+from digital_folder.core.config import project_settings
+from digital_folder.core.dependencies import validate_admin
+from digital_folder.core.metrics import CONTENT_TYPE
+from digital_folder.core.responses import HeadersRoute
+from digital_folder.core.slow_queries import SlowQuery
+from digital_folder.packages.Server.dto import ServerDTO
 from digital_folder.packages.Server.schemas import ServerResponse, ServerStatus
 
-server_router = APIRouter()
+server_router = APIRouter(route_class=HeadersRoute)
 
 
 class ServerRouter:
     def __init__(self, router: APIRouter):
+        self.model_dto = ServerDTO
         self.router = router
         self.router.add_api_route("/status", self.status_check, methods=["GET"])
+        self.router.add_api_route(
+            "/metrics",
+            self.metrics,
+            methods=["GET"],
+            response_class=PlainTextResponse,
+            responses={200: {"content": {CONTENT_TYPE: {}}}},
+            include_in_schema=project_settings.metrics_enabled,
+        )
+        self.router.add_api_route(
+            "/slow_queries",
+            self.slow_queries,
+            methods=["GET"],
+            dependencies=[Depends(validate_admin)],
+            include_in_schema=project_settings.slow_query_enabled,
+        )
 
     @staticmethod
     def status_check() -> ServerResponse:
@@ -16,5 +42,31 @@ class ServerRouter:
 
         return ServerResponse(status=ServerStatus.ON)
 
+    def metrics(self, authorization: Optional[str] = Header(None)) -> PlainTextResponse:
+        """Prometheus metrics"""
+
+        if not project_settings.metrics_enabled:
+            raise HTTPException(status_code=404, detail="Not Found")
+
+        token = project_settings.metrics_token
+        if token is not None and not secrets.compare_digest(
+            authorization or "", f"Bearer {token.get_secret_value()}"
+        ):
+            raise HTTPException(
+                status_code=401,
+                detail="Invalid metrics token.",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+        return PlainTextResponse(self.model_dto().metrics(), media_type=CONTENT_TYPE)
+
+    def slow_queries(self) -> List[SlowQuery]:
+        """Slowest statements of the window (admins only)"""
+
+        if not project_settings.slow_query_enabled:
+            raise HTTPException(status_code=404, detail="Not Found")
+
+        return self.model_dto().slow_queries()
+
 
 ServerRouter(server_router)
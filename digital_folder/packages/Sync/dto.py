@@ -0,0 +1,105 @@
+from typing import Any, Callable, List
+
+from sqlalchemy.orm import selectinload
+
+from digital_folder.core.pagination.types import Fieldset
+from digital_folder.db.models import Group, Project, Tag, Ticket, Tombstone
+from digital_folder.db.service import DbService
+from digital_folder.packages.Group.dto import GroupDTO
+from digital_folder.packages.Project.dto import ProjectDTO
+from digital_folder.packages.Sync.schemas import SyncDeleted, SyncParams, SyncResponse
+from digital_folder.packages.Tag.dto import TagDTO
+from digital_folder.packages.Ticket.dto import TicketDTO
+from digital_folder.packages.User.schemas import UserRole
+
+
+class SyncDTO:
+    # Collections the read responses are built from, see 'check_etag'
+    COLLECTIONS = ("projects", "project_urls", "tags", "groups", "tickets")
+
+    def __init__(self, db: DbService):
+        self.db = db
+        self.project_dto = ProjectDTO(db)
+        self.tag_dto = TagDTO(db)
+        self.group_dto = GroupDTO(db)
+
+    def sources(self) -> dict[str, tuple[Any, List[Any], Callable[[Any], Any]]]:
+        """
+        Synced collections the user can list.
+
+        Returns:
+            dict[str, tuple[Any, List[Any], Callable[[Any], Any]]]: Collection -> model, loader options and parser.
+        """
+
+        sources = {
+            "projects": (
+                Project,
+                ProjectDTO.load_options(Fieldset()),
+                self.project_dto.project_parser,
+            ),
+            "tags": (
+                Tag,
+                [selectinload(Tag.group).selectinload(Group.tags)],
+                self.tag_dto.tag_parser,
+            ),
+            "groups": (
+                Group,
+                [selectinload(Group.tags)],
+                lambda group: self.group_dto.group_parser(group, True),
+            ),
+        }
+
+        # Same roles as the ticket routes, see 'validate_role'
+        if self.db.user.role in [UserRole.ADMIN, UserRole.USER]:
+            sources["tickets"] = (Ticket, [], TicketDTO.ticket_parser)
+
+        return sources
+
+    def changes(self, params: SyncParams) -> SyncResponse:
+        """
+        Retrieve the rows created, updated or deleted after a version, oldest first.
+
+        Args:
+            params (SyncParams): The version of the last sync and the max number of changes.
+
+        Returns:
+            SyncResponse: The changed rows per collection, the deleted rows and the next version.
+        """
+
+        sources = self.sources()
+
+        # Every collection is read up to the limit, then merged in version order
+        changes = []
+        for collection, (model, options, _) in sources.items():
+            for row in self.db.get_changed(
+                model, params.since, params.limit + 1, options
+            ):
+                changes.append((row.version, collection, row))
+
+        for tombstone in self.db.get_changed(Tombstone, params.since, params.limit + 1):
+            if tombstone.entity in sources:
+                changes.append((tombstone.version, "deleted", tombstone))
+
+        changes.sort(key=lambda change: change[0])
+        page = changes[: params.limit]
+
+        response = SyncResponse.model_construct(
+            version=page[-1][0] if page else params.since,
+            has_more=len(changes) > params.limit,
+            projects=[],
+            tags=[],
+            groups=[],
+            tickets=[],
+            deleted=[],
+        )
+        for version, collection, row in page:
+            if collection == "deleted":
+                response.deleted.append(
+                    SyncDeleted.model_construct(
+                        entity=row.entity, id=row.entity_id, version=version
+                    )
+                )
+            else:
+                getattr(response, collection).append(sources[collection][2](row))
+
+        return response
@@ -0,0 +1,54 @@
+from fastapi import APIRouter, Depends, Query, Request
+
+from digital_folder.core.config import project_settings
+from digital_folder.core.dependencies import get_db_validate_user
+from digital_folder.core.etag import check_etag
+from digital_folder.core.response_cache import cached_response
+from digital_folder.core.responses import HeadersRoute, trusted_response
+from digital_folder.db.service import DbService
+from digital_folder.packages.Sync.dto import SyncDTO
+from digital_folder.packages.Sync.schemas import SyncParams, SyncResponse
+
+sync_router = APIRouter(route_class=HeadersRoute)
+
+
+class SyncRouter:
+    def __init__(self, router: APIRouter):
+        self.model_dto = SyncDTO
+        self.router = router
+        self.router.add_api_route(
+            "",
+            self.sync,
+            methods=["GET"],
+            **trusted_response(SyncResponse),
+        )
+
+    async def sync(
+        self,
+        request: Request,
+        since: int = Query(
+            0, ge=0, description="Version returned by the last sync, 0 for everything"
+        ),
+        limit: int = Query(
+            project_settings.sync_page_size,
+            ge=1,
+            le=project_settings.sync_page_size,
+            description="Max number of changes",
+        ),
+        db: DbService = Depends(get_db_validate_user),
+    ) -> SyncResponse:
+        """List the projects, tags, groups and tickets changed since a version"""
+
+        check_etag(request, db, self.model_dto.COLLECTIONS)
+        params = SyncParams(since=since, limit=limit)
+
+        return await cached_response(
+            request,
+            db,
+            self.model_dto.COLLECTIONS,
+            params,
+            lambda db: self.model_dto(db).changes(params),
+        )
+
+
+SyncRouter(sync_router)
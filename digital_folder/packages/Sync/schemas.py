@@ -0,0 +1,43 @@
+from typing import List
+from uuid import UUID
+
+from pydantic import BaseModel, Field
+
+from digital_folder.core.config import project_settings
+from digital_folder.packages.Group.schemas import GroupOut
+from digital_folder.packages.Project.schemas import ProjectOut
+from digital_folder.packages.Tag.schemas import TagOut
+from digital_folder.packages.Ticket.schemas import TicketOut
+
+
+class SyncParams(BaseModel):
+    """Sync Params schema"""
+
+    # Version of the last sync, 0 for a full sync
+    since: int = Field(0, ge=0)
+    limit: int = Field(
+        project_settings.sync_page_size, ge=1, le=project_settings.sync_page_size
+    )
+
+
+class SyncDeleted(BaseModel):
+    """Sync Deleted schema"""
+
+    entity: str
+    id: UUID
+    version: int
+
+
+class SyncResponse(BaseModel):
+    """Sync Response schema"""
+
+    # Next 'since', the version of the last change returned
+    version: int
+    # More changes are left, sync again from 'version'
+    has_more: bool
+    projects: List[ProjectOut] = []
+    tags: List[TagOut] = []
+    groups: List[GroupOut] = []
+    # Only for the users allowed to list tickets
+    tickets: List[TicketOut] = []
+    deleted: List[SyncDeleted] = []
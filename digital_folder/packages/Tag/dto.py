@@ -2,10 +2,16 @@ from typing import Optional, Union
 from uuid import UUID
 
 from fastapi import HTTPException
+from sqlalchemy.orm import selectinload
 
 from digital_folder.core.auth import validate_ownership, validate_unique
-from digital_folder.core.pagination.types import PaginatedResponse, QueryParams
-from digital_folder.db.models import Tag
+from digital_folder.core.fragments import fragment_cache, fragment_key
+from digital_folder.core.pagination.types import (
+    Fieldset,
+    PaginatedResponse,
+    QueryParams,
+)
+from digital_folder.db.models import Group, Tag
 from digital_folder.db.service import DbService
 from digital_folder.packages.Group.dto import GroupDTO
 from digital_folder.packages.Tag.schemas import (
@@ -17,28 +23,41 @@ from digital_folder.packages.Tag.schemas import (
 
 
 class TagDTO:
+    # Collections the read responses are built from, see 'check_etag'
+    COLLECTIONS = ("tags", "groups")
+
+    # Output field -> relation it comes from
+    RELATION_FIELDS = {"group": "group"}
+
     def __init__(self, db: DbService):
         self.db = db
+        self.group_dto = GroupDTO(db)
 
-    def list(self, params: QueryParams) -> PaginatedResponse:
+    def list(self, params: QueryParams) -> PaginatedResponse[TagOut]:
         """
         Retrieve tags from the database.
 
         Args:
             params (QueryParams): Params to select what data to retrieve.
-            Can include filters, items per page, page, search and sort by.
+            Can include filters, items per page, page, search, sort by and a fieldset.
 
         Returns:
-            PaginatedResponse: Contains a list of tags and the count.
+            PaginatedResponse[TagOut]: Contains a list of tags and the count.
         """
 
-        tags, count = self.db.get_all(Tag, params)
+        options = DbService.load_options(
+            Tag,
+            params.fieldset,
+            {"group": [selectinload(Tag.group).selectinload(Group.tags)]},
+        )
+
+        tags, count = self.db.get_all(Tag, params, options)
         parsed_tags = []
         for tag in tags:
-            tag = self.tag_parser(tag)
+            tag = self.tag_parser(tag, True, params.fieldset)
             parsed_tags.append(tag)
 
-        return PaginatedResponse(items=parsed_tags, count=count)
+        return PaginatedResponse[TagOut].model_construct(items=parsed_tags, count=count)
 
     def get_by_id(self, tag_id: UUID) -> TagOut:
         """
@@ -68,7 +87,7 @@ class TagDTO:
             TagOut: The created tag data.
         """
 
-        validate_ownership(GroupDTO(self.db), [tag_data.group_id], True)
+        validate_ownership(self.group_dto, [tag_data.group_id], True)
         validate_unique(self.db, Tag, tag_data.name)
 
         tag_dict = tag_data.dict()
@@ -91,7 +110,7 @@ class TagDTO:
 
         validate_ownership(self, [tag_id])
         if tag_data.group_id:
-            validate_ownership(GroupDTO(self.db), [tag_data.group_id], True)
+            validate_ownership(self.group_dto, [tag_data.group_id], True)
         if tag_data.name:
             validate_unique(self.db, Tag, tag_data.name)
 
@@ -112,52 +131,67 @@ class TagDTO:
         self.db.delete(Tag, tag_id)
 
     def tag_parser(
-        self, tag: Tag, include_group: Optional[bool] = True
+        self,
+        tag: Tag,
+        include_group: Optional[bool] = True,
+        fieldset: Optional[Fieldset] = None,
     ) -> Union[TagOut, TagWithoutGroupOut]:
         """
         This function takes tag data and turns it into a TagOut object.
+        Built with 'model_construct' since the values come from typed db columns.
+        Full tags are memoized in the fragment cache, keyed by the tags and groups versions.
 
         Args:
             tag (Tag): The tag data.
             include_group (Optional[bool]): Flag to return tag with or without group.
+            fieldset (Optional[Fieldset]): Fields and relations to return when including the group. Defaults to all.
 
         Returns:
             TagOut: The parsed tag data.
         """
 
+        fieldset = fieldset or Fieldset()
+
+        # Full fragments are shared by every request until tags or groups change
+        fragment = fieldset.selects_all()
+        if fragment:
+            key = fragment_key(self.db, "tag", tag.id, include_group)
+            parsed = fragment_cache.get(key)
+            if parsed is not None:
+                return parsed
+
         if include_group:
+            parsed_tag = {
+                "id": lambda: tag.id,
+                "name": lambda: tag.name or None,
+                "icon": lambda: tag.icon or None,
+                "color": lambda: tag.color,
+                "group": lambda: self.group_dto.group_parser(tag.group, False),
+                "group_id": lambda: tag.group_id,
+                "created_by": lambda: tag.created_by,
+            }
+
+            parsed = TagOut.model_construct(
+                **fieldset.pick(parsed_tag, self.RELATION_FIELDS)
+            )
+        else:
             parsed_tag = {
                 "id": tag.id,
                 "name": tag.name or None,
                 "icon": tag.icon or None,
                 "color": tag.color,
-                "group": GroupDTO(self.db).group_parser(tag.group, False),
-                "group_id": tag.group_id,
                 "created_by": tag.created_by,
             }
 
-            return TagOut(
+            parsed = TagWithoutGroupOut.model_construct(
                 id=parsed_tag["id"],
                 name=parsed_tag["name"],
                 icon=parsed_tag["icon"],
                 color=parsed_tag["color"],
-                group=parsed_tag["group"],
-                group_id=parsed_tag["group_id"],
                 created_by=parsed_tag["created_by"],
             )
 
-        parsed_tag = {
-            "id": tag.id,
-            "name": tag.name or None,
-            "icon": tag.icon or None,
-            "color": tag.color,
-            "created_by": tag.created_by,
-        }
-
-        return TagWithoutGroupOut(
-            id=parsed_tag["id"],
-            name=parsed_tag["name"],
-            icon=parsed_tag["icon"],
-            color=parsed_tag["color"],
-            created_by=parsed_tag["created_by"],
-        )
+        if fragment:
+            fragment_cache.set(key, parsed)
+
+        return parsed
@@ -1,29 +1,50 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Request
 
 from digital_folder.core.dependencies import get_db_validate_role, get_db_validate_user
+from digital_folder.core.etag import check_etag
 from digital_folder.core.pagination.types import PaginatedResponse
+from digital_folder.core.response_cache import cached_response, get_cache_policy
+from digital_folder.core.responses import HeadersRoute, trusted_response
 from digital_folder.core.pagination.utils import query_params_parser
+from digital_folder.db.db import db_executor
 from digital_folder.db.service import DbService
 from digital_folder.packages.Tag.dto import TagDTO
 from digital_folder.packages.Tag.schemas import TagCreate, TagPatch, TagOut
 
-tag_router = APIRouter()
+tag_router = APIRouter(route_class=HeadersRoute)
 
 
 class TagRouter:
     def __init__(self, router: APIRouter):
         self.model_dto = TagDTO
+        self.cache_policy = get_cache_policy("tags")
         self.router = router
-        self.router.add_api_route("/list", self.list, methods=["GET"])
-        self.router.add_api_route("/create", self.create, methods=["POST"])
-        self.router.add_api_route("/patch/{tag_id}", self.patch, methods=["PATCH"])
+        self.router.add_api_route(
+            "/list",
+            self.list,
+            methods=["GET"],
+            **trusted_response(PaginatedResponse[TagOut]),
+        )
+        self.router.add_api_route(
+            "/create",
+            self.create,
+            methods=["POST"],
+            **trusted_response(TagOut),
+        )
+        self.router.add_api_route(
+            "/patch/{tag_id}",
+            self.patch,
+            methods=["PATCH"],
+            **trusted_response(TagOut),
+        )
         self.router.add_api_route("/delete/{tag_id}", self.delete, methods=["DELETE"])
 
     async def list(
         self,
+        request: Request,
         filters: Optional[str] = Query(None, description="Comma-separated group IDs"),
         items_per_page: int = Query(
             10,
@@ -39,10 +60,17 @@ class TagRouter:
             description="""JSON string like [{"key":"name","order":"desc"}]""",
             alias="sortBy",
         ),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return ex: name,color"
+        ),
+        include: Optional[str] = Query(
+            None, description="Comma-separated relations to expand ex: group"
+        ),
         db: DbService = Depends(get_db_validate_user),
-    ) -> PaginatedResponse:
+    ) -> PaginatedResponse[TagOut]:
         """List tags"""
 
+        check_etag(request, db, self.model_dto.COLLECTIONS)
         params = query_params_parser(
             db=db,
             filters=filters,
@@ -50,9 +78,18 @@ class TagRouter:
             page=page,
             search=search,
             sort_by=sort_by,
+            fields=fields,
+            include=include,
         )
 
-        return self.model_dto(db).list(params)
+        return await cached_response(
+            request,
+            db,
+            self.model_dto.COLLECTIONS,
+            params,
+            lambda db: self.model_dto(db).list(params),
+            self.cache_policy,
+        )
 
     async def create(
         self,
@@ -61,7 +98,7 @@ class TagRouter:
     ) -> TagOut:
         """Create tag"""
 
-        return self.model_dto(db).create(tag)
+        return await db_executor.run(self.model_dto(db).create, tag)
 
     async def patch(
         self,
@@ -71,14 +108,14 @@ class TagRouter:
     ) -> TagOut:
         """Edit tag"""
 
-        return self.model_dto(db).edit_by_id(tag_id, tag)
+        return await db_executor.run(self.model_dto(db).edit_by_id, tag_id, tag)
 
     async def delete(
         self, tag_id: UUID, db: DbService = Depends(get_db_validate_role)
     ) -> None:
         """Delete tag"""
 
-        return self.model_dto(db).delete_by_id(tag_id)
+        return await db_executor.run(self.model_dto(db).delete_by_id, tag_id)
 
 
 TagRouter(tag_router)
@@ -1,9 +1,14 @@
+from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException
 
 from digital_folder.core.auth import validate_ownership, validate_unique
-from digital_folder.core.pagination.types import PaginatedResponse, QueryParams
+from digital_folder.core.pagination.types import (
+    Fieldset,
+    PaginatedResponse,
+    QueryParams,
+)
 from digital_folder.db.models import Ticket
 from digital_folder.db.service import DbService
 from digital_folder.packages.Ticket.schemas import (
@@ -17,31 +22,38 @@ from digital_folder.supabase.storage import SupabaseDTO
 
 
 class TicketDTO:
+    # Collections the read responses are built from, see 'check_etag'
+    COLLECTIONS = ("tickets",)
+
     def __init__(self, db: DbService):
         self.db = db
         self.supabase_storage_config = SupabaseStorageConfig(
             bucket=self.db.user.env, folder="tickets"
         )
 
-    def list(self, params: QueryParams) -> PaginatedResponse:
+    def list(self, params: QueryParams) -> PaginatedResponse[TicketOut]:
         """
         Retrieve tickets from the database.
 
         Args:
             params (QueryParams): Params to select what data to retrieve.
-            Can include filters, items per page, page, search and sort by.
+            Can include filters, items per page, page, search, sort by and a fieldset.
 
         Returns:
-            PaginatedResponse: Contains a list of tickets and the count.
+            PaginatedResponse[TicketOut]: Contains a list of tickets and the count.
         """
 
-        tickets, count = self.db.get_all(Ticket, params)
+        options = DbService.load_options(Ticket, params.fieldset, {})
+
+        tickets, count = self.db.get_all(Ticket, params, options)
         parsed_tickets = []
         for ticket in tickets:
-            ticket = self.ticket_parser(ticket)
+            ticket = self.ticket_parser(ticket, params.fieldset)
             parsed_tickets.append(ticket)
 
-        return PaginatedResponse(items=parsed_tickets, count=count)
+        return PaginatedResponse[TicketOut].model_construct(
+            items=parsed_tickets, count=count
+        )
 
     def get_by_id(self, ticket_id: UUID) -> TicketOut:
         """
@@ -121,35 +133,30 @@ class TicketDTO:
         self.db.delete(Ticket, ticket_id)
 
     @staticmethod
-    def ticket_parser(ticket: Ticket) -> TicketOut:
+    def ticket_parser(ticket: Ticket, fieldset: Optional[Fieldset] = None) -> TicketOut:
         """
         This function takes ticket data and turns it into a TicketOut object.
+        Skips validation ('model_construct'), the ticket row is already typed.
 
         Args:
             ticket (Ticket): The ticket data.
+            fieldset (Optional[Fieldset]): Fields to return. Defaults to all.
 
         Returns:
             GroupOut: The parsed ticket object.
         """
 
+        fieldset = fieldset or Fieldset()
+
         parsed_ticket = {
-            "id": ticket.id,
-            "name": ticket.name,
-            "description": ticket.description,
-            "image": ticket.image or None,
-            "status": TicketStatus(ticket.status.value),
-            "created_by": ticket.created_by,
-            "created_at": ticket.created_at,
-            "updated_at": ticket.updated_at or None,
+            "id": lambda: ticket.id,
+            "name": lambda: ticket.name,
+            "description": lambda: ticket.description,
+            "image": lambda: ticket.image or None,
+            "status": lambda: TicketStatus(ticket.status.value),
+            "created_by": lambda: ticket.created_by,
+            "created_at": lambda: ticket.created_at,
+            "updated_at": lambda: ticket.updated_at or None,
         }
 
-        return TicketOut(
-            id=parsed_ticket["id"],
-            name=parsed_ticket["name"],
-            description=parsed_ticket["description"],
-            image=parsed_ticket["image"],
-            status=parsed_ticket["status"],
-            created_by=parsed_ticket["created_by"],
-            created_at=parsed_ticket["created_at"],
-            updated_at=parsed_ticket["updated_at"],
-        )
+        return TicketOut.model_construct(**fieldset.pick(parsed_ticket, {}))
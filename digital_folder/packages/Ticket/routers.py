@@ -1,54 +1,105 @@
 from typing import Optional
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Header, Query, Request
 
 from digital_folder.core.dependencies import get_db_validate_role, get_db_validate_user
+from digital_folder.core.etag import check_etag
+from digital_folder.core.idempotency import (
+    IDEMPOTENCY_KEY_HEADER,
+    idempotent_response,
+)
 from digital_folder.core.pagination.types import PaginatedResponse
+from digital_folder.core.response_cache import cached_response
+from digital_folder.core.responses import HeadersRoute, trusted_response
 from digital_folder.core.pagination.utils import query_params_parser
-from digital_folder.db.service import DbService
+from digital_folder.db.db import db_executor
+from digital_folder.db.service import DbService, run_in_session
 from digital_folder.packages.Ticket.dto import TicketDTO
 from digital_folder.packages.Ticket.schemas import TicketCreate, TicketPatch, TicketOut
 
-ticket_router = APIRouter()
+ticket_router = APIRouter(route_class=HeadersRoute)
 
 
 class TicketRouter:
     def __init__(self, router: APIRouter):
         self.model_dto = TicketDTO
         self.router = router
-        self.router.add_api_route("/list", self.list, methods=["GET"])
-        self.router.add_api_route("/create", self.create, methods=["POST"])
-        self.router.add_api_route("/patch/{ticket_id}", self.patch, methods=["PATCH"])
+        self.router.add_api_route(
+            "/list",
+            self.list,
+            methods=["GET"],
+            **trusted_response(PaginatedResponse[TicketOut]),
+        )
+        self.router.add_api_route(
+            "/create",
+            self.create,
+            methods=["POST"],
+            **trusted_response(TicketOut),
+        )
+        self.router.add_api_route(
+            "/patch/{ticket_id}",
+            self.patch,
+            methods=["PATCH"],
+            **trusted_response(TicketOut),
+        )
         self.router.add_api_route(
             "/delete/{ticket_id}", self.delete, methods=["DELETE"]
         )
 
     async def list(
         self,
+        request: Request,
         filters: Optional[str] = Query(
             None, description="""User UUID ex: {"created_by":{id}}"""
         ),
+        fields: Optional[str] = Query(
+            None, description="Comma-separated fields to return ex: name,status"
+        ),
         db: DbService = Depends(get_db_validate_role),
-    ) -> PaginatedResponse:
+    ) -> PaginatedResponse[TicketOut]:
         """List tickets"""
 
+        check_etag(request, db, self.model_dto.COLLECTIONS)
         params = query_params_parser(
             db=db,
             filters=filters,
             items_per_page=-1,
+            fields=fields,
         )
 
-        return self.model_dto(db).list(params)
+        return await cached_response(
+            request,
+            db,
+            self.model_dto.COLLECTIONS,
+            params,
+            lambda db: self.model_dto(db).list(params),
+        )
 
     async def create(
         self,
+        request: Request,
         ticket: TicketCreate,
+        idempotency_key: Optional[str] = Header(
+            None,
+            alias=IDEMPOTENCY_KEY_HEADER,
+            max_length=255,
+            description="Unique per request, retries with the same key replay the first response",
+        ),
         db: DbService = Depends(get_db_validate_user),
     ) -> TicketOut:
         """Create ticket"""
 
-        return self.model_dto(db).create(ticket)
+        return await idempotent_response(
+            request,
+            db.user,
+            idempotency_key,
+            ticket.model_dump(mode="json"),
+            # Kept running if the request is cancelled, so not with the request session
+            lambda: db_executor.run(
+                run_in_session, db.user, lambda db: self.model_dto(db).create(ticket)
+            ),
+        )
 
     async def patch(
         self,
@@ -58,14 +109,14 @@ class TicketRouter:
     ) -> TicketOut:
         """Edit ticket"""
 
-        return self.model_dto(db).edit_by_id(ticket_id, ticket)
+        return await db_executor.run(self.model_dto(db).edit_by_id, ticket_id, ticket)
 
     async def delete(
         self, ticket_id: UUID, db: DbService = Depends(get_db_validate_role)
     ) -> None:
         """Delete ticket"""
 
-        return self.model_dto(db).delete_by_id(ticket_id)
+        return await db_executor.run(self.model_dto(db).delete_by_id, ticket_id)
 
 
 TicketRouter(ticket_router)
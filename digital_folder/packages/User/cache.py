@@ -0,0 +1,34 @@
+from typing import Optional
+from uuid import UUID
+
+from digital_folder.core.config import project_settings
+from digital_folder.helpers.cache import LRUCache
+from digital_folder.packages.User.schemas import UserRole
+
+# User.role is unique, so every role maps to a single user ID.
+# Cleared by DbService on User writes, the TTL keeps other workers eventually consistent.
+role_user_id_cache = LRUCache(
+    maxsize=len(UserRole), ttl=project_settings.role_cache_ttl
+)
+
+# User ID -> role of the users authenticated by this worker, for the admission limits.
+# No TTL, a user keeps its role until the next User write clears it (DbService).
+user_roles: dict[UUID, UserRole] = {}
+
+
+def remember_role(user_id: UUID, role: UserRole) -> None:
+    user_roles[user_id] = role
+
+
+def cached_role(user_id: UUID) -> Optional[UserRole]:
+    """
+    Look up the role of a user in memory only, never in the database.
+
+    Args:
+        user_id (UUID): The user ID.
+
+    Returns:
+        Optional[UserRole]: The user role, or None if the user wasn't authenticated yet.
+    """
+
+    return user_roles.get(user_id)
@@ -1,14 +1,19 @@
+from typing import Optional
 from uuid import UUID
 
 from fastapi import HTTPException
 from sqlalchemy.orm import InstrumentedAttribute
 
 from digital_folder.core.config import project_settings
+from digital_folder.db.db import db_executor
 from digital_folder.db.models import User
 from digital_folder.db.service import DbService
-from digital_folder.helpers.secrets import verify_password
+from digital_folder.helpers.secrets import verify_password_async
 from digital_folder.packages.AccessToken.dto import create_access_token
 from digital_folder.packages.AccessToken.schemas import TokenData
+from digital_folder.packages.RefreshToken.dto import RefreshTokenDTO
+from digital_folder.packages.RefreshToken.schemas import RefreshTokenIn
+from digital_folder.packages.User.cache import role_user_id_cache
 from digital_folder.packages.User.schemas import (
     UserLoginForm,
     UserLoginResponse,
@@ -21,39 +26,87 @@ class UserDTO:
     def __init__(self, db: DbService):
         self.db = db
 
-    def login(self, form_data: UserLoginForm) -> UserLoginResponse:
+    async def login(self, form_data: UserLoginForm) -> UserLoginResponse:
         """
         Authenticate a user using their credentials and generate a JWT access token.
         Starts by checking if user exists in the database, then validates password,
         then creates an access token and returns the UserLoginResponse.
+        Password verification and the queries run in bounded executors off the event loop.
 
         Args:
             form_data (UserLoginForm): The login form data containing the username and password.
 
         Returns:
-            UserLoginResponse: Contains the JWT access token, its type and the authenticated user.
+            UserLoginResponse: Contains the JWT access token, its type, a refresh token and the authenticated user.
         """
 
-        user = self.db.get_by_field(User, User.username, form_data.username)
+        user = await db_executor.run(
+            self.db.get_by_field, User, User.username, form_data.username
+        )
         if not user:
             raise HTTPException(
                 status_code=400,
                 detail=f"User {form_data.username} not found.",
             )
 
-        if not verify_password(form_data.password.get_secret_value(), user.password):
+        if not await verify_password_async(
+            form_data.password.get_secret_value(), user.password
+        ):
             raise HTTPException(
                 status_code=400,
                 detail="Login failed - Invalid username or password.",
             )
 
-        token_data = TokenData(id=str(user.id))
-        access_token = create_access_token(token_data)
+        refresh_token = await db_executor.run(RefreshTokenDTO(self.db).create, user.id)
+
+        return await db_executor.run(self.login_response, user, refresh_token)
+
+    def refresh(self, refresh_data: RefreshTokenIn) -> UserLoginResponse:
+        """
+        Exchange a refresh token for a new access token without re-checking the password.
+        The refresh token is rotated, so the one provided can't be used again.
+
+        Args:
+            refresh_data (RefreshTokenIn): The refresh token issued at login or at the previous refresh.
+
+        Returns:
+            UserLoginResponse: Contains the new JWT access token, the new refresh token and the user.
+        """
+
+        user, refresh_token = RefreshTokenDTO(self.db).rotate(
+            refresh_data.refresh_token
+        )
+
+        return self.login_response(user, refresh_token)
+
+    def login_response(self, user: User, refresh_token: str) -> UserLoginResponse:
+        """
+        Create an access token for an authenticated user and build the UserLoginResponse.
+
+        Args:
+            user (User): The authenticated user.
+            refresh_token (str): The plain refresh token to hand to the client.
+
+        Returns:
+            UserLoginResponse: Contains the JWT access token, its type, the refresh token and the user.
+        """
 
         parsed_user = self.user_parser(user)
 
+        filter_id = self.get_filter_id(parsed_user)
+        token_data = TokenData(
+            id=str(user.id),
+            username=parsed_user.username,
+            role=parsed_user.role.value,
+            filter_id=str(filter_id) if filter_id else None,
+        )
+        access_token = create_access_token(token_data)
+
         return UserLoginResponse(
-            access_token=access_token, token_type="bearer", user=parsed_user
+            access_token=access_token,
+            token_type="bearer",
+            refresh_token=refresh_token,
+            user=parsed_user,
         )
 
     def get_by_id(self, user_id: UUID) -> UserOut:
@@ -94,6 +147,61 @@ class UserDTO:
 
         return self.user_parser(user)
 
+    def get_filter_id(self, user: UserOut) -> Optional[UUID]:
+        """
+        Resolve the ID used to scope the data a user can see, based on its role.
+
+        Args:
+            user (UserOut): The user data.
+
+        Returns:
+            Optional[UUID]: None for admins, the user ID for users and the admin ID for viewers.
+        """
+
+        if user.role == UserRole.ADMIN:
+            return None
+        if user.role == UserRole.USER:
+            return user.id
+
+        return self.get_id_by_role(UserRole.ADMIN)
+
+    def get_id_by_role(self, role: UserRole) -> UUID:
+        """
+        Resolve the ID of the user holding a role, from the process-wide role cache when possible.
+
+        Args:
+            role (UserRole): The user role.
+
+        Returns:
+            UUID: The user ID.
+        """
+
+        user_id = role_user_id_cache.get(role)
+        if user_id is None:
+            user_id = self.load_role_ids().get(role)
+            if not user_id:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"User: { {User.role: role} } not found.",
+                )
+
+        return user_id
+
+    def load_role_ids(self) -> dict[UserRole, UUID]:
+        """
+        Read every user and (re)fill the process-wide role cache.
+
+        Returns:
+            dict[UserRole, UUID]: The user ID of each role.
+        """
+
+        users, _ = self.db.get_all(User)
+        role_ids = {UserRole(user.role.value): user.id for user in users}
+        for role, user_id in role_ids.items():
+            role_user_id_cache.set(role, user_id)
+
+        return role_ids
+
     @staticmethod
     def user_parser(user: User) -> UserOut:
         """
@@ -1,11 +1,14 @@
 from fastapi import APIRouter, Depends
 
+from digital_folder.core.responses import HeadersRoute
+from digital_folder.db.db import db_executor
 from digital_folder.db.dependencies import get_db
 from digital_folder.db.service import DbService
+from digital_folder.packages.RefreshToken.schemas import RefreshTokenIn
 from digital_folder.packages.User.dto import UserDTO
 from digital_folder.packages.User.schemas import UserLoginForm, UserLoginResponse
 
-user_router = APIRouter()
+user_router = APIRouter(route_class=HeadersRoute)
 
 
 class UserRouter:
@@ -13,6 +16,7 @@ class UserRouter:
         self.model_dto = UserDTO
         self.router = router
         self.router.add_api_route("/login", self.login, methods=["POST"])
+        self.router.add_api_route("/refresh", self.refresh, methods=["POST"])
 
     async def login(
         self,
@@ -21,7 +25,16 @@ class UserRouter:
     ) -> UserLoginResponse:
         """User login"""
 
-        return self.model_dto(db).login(form_data)
+        return await self.model_dto(db).login(form_data)
+
+    async def refresh(
+        self,
+        refresh_data: RefreshTokenIn,
+        db: DbService = Depends(get_db),
+    ) -> UserLoginResponse:
+        """Refresh access token"""
+
+        return await db_executor.run(self.model_dto(db).refresh, refresh_data)
 
 
 UserRouter(user_router)
@@ -0,0 +1,68 @@
+import timeit
+import uuid
+from typing import List, Union
+
+from pydantic import BaseModel
+
+from digital_folder.core.pagination.types import PaginatedResponse
+from digital_folder.packages.Group.schemas import GroupOut
+from digital_folder.packages.Project.schemas import ProjectOut
+from digital_folder.packages.Tag.schemas import TagOut
+from digital_folder.packages.Ticket.schemas import TicketOut
+
+
+class UnionPaginatedResponse(BaseModel):
+    """The previous, non generic, PaginatedResponse"""
+
+    items: List[Union[GroupOut, ProjectOut, TagOut, TicketOut]]
+    count: int
+
+
+def make_projects(count: int) -> List[ProjectOut]:
+    group = {"id": uuid.uuid4(), "name": "Backend", "created_by": uuid.uuid4()}
+    tags = [
+        {
+            "id": uuid.uuid4(),
+            "name": f"Tag {i}",
+            "color": "#000000",
+            "group": group,
+            "group_id": group["id"],
+            "created_by": group["created_by"],
+        }
+        for i in range(5)
+    ]
+
+    return [
+        ProjectOut(
+            id=uuid.uuid4(),
+            name=f"Project {i}",
+            urls=[],
+            description="Lorem ipsum " * 20,
+            tags=tags,
+            tag_ids=[tag["id"] for tag in tags],
+            images=["cover.png"],
+            created_by=group["created_by"],
+        )
+        for i in range(count)
+    ]
+
+
+def run_benchmark(items_count: int = 1000, repeat: int = 20):
+    items = make_projects(items_count)
+
+    for name, schema in [
+        ("Union", UnionPaginatedResponse),
+        ("Generic", PaginatedResponse[ProjectOut]),
+    ]:
+        # Same round trip FastAPI does: build the response, then dump it for the response_model
+        seconds = timeit.timeit(
+            lambda: schema.model_validate(
+                schema(items=items, count=items_count).model_dump()
+            ),
+            number=repeat,
+        )
+        print(f"{name:<8} {seconds / repeat * 1000:8.2f} ms per {items_count} items")
+
+
+if __name__ == "__main__":
+    run_benchmark()
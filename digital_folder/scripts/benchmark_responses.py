@@ -0,0 +1,44 @@
+import timeit
+import tracemalloc
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+from digital_folder.core.pagination.types import PaginatedResponse
+from digital_folder.core.responses import FastJSONResponse
+
+# Group schemas first, they close the Group <-> Tag forward reference (see Group.schemas)
+from digital_folder.packages.Group.schemas import GroupOut  # noqa: F401
+from digital_folder.packages.Project.schemas import ProjectOut
+from digital_folder.scripts.benchmark_pagination import make_projects
+
+
+def peak_allocations(func) -> int:
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak
+
+
+def run_benchmark(items_count: int = 500, repeat: int = 20):
+    page = PaginatedResponse[ProjectOut].model_construct(
+        items=make_projects(items_count), count=items_count
+    )
+
+    for name, encode in [
+        # What FastAPI does by default: jsonable_encoder walk + stdlib json
+        ("json", lambda: JSONResponse(jsonable_encoder(page)).body),
+        ("orjson", lambda: FastJSONResponse(page).body),
+    ]:
+        seconds = timeit.timeit(encode, number=repeat)
+        peak = peak_allocations(encode)
+        print(
+            f"{name:<8} {seconds / repeat * 1000:8.2f} ms"
+            f" {peak / 1024:10.1f} KiB peak per /projects/list page of {items_count}"
+        )
+
+
+if __name__ == "__main__":
+    run_benchmark()
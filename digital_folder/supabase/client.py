@@ -10,6 +10,14 @@ class SupabaseStorageConfig(BaseModel):
     folder: str
 
 
+class StorageFile(BaseModel):
+    """An uploaded file read in memory, still usable once the request closed its UploadFile"""
+
+    filename: str
+    content_type: str
+    content: bytes
+
+
 def get_supabase_client() -> Client:
     """
     Initialize a new Supabase client using the unique Supabase project url and the unique Supabase service role key.
@@ -1,30 +1,76 @@
-from typing import List
-
-from fastapi import APIRouter, Depends, File, HTTPException, UploadFile
+import hashlib
+from typing import List, Optional
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    Header,
+    HTTPException,
+    Request,
+    UploadFile,
+)
 
 from digital_folder.core.dependencies import validate_role
+from digital_folder.core.idempotency import IDEMPOTENCY_KEY_HEADER, idempotent_response
+from digital_folder.core.metrics import supabase_call
+from digital_folder.core.responses import HeadersRoute
+from digital_folder.db.db import db_executor
 from digital_folder.packages.User.schemas import UserDb
 from digital_folder.supabase.client import (
     get_supabase_client,
+    StorageFile,
     SupabaseStorageConfig,
     validate_folder,
 )
 
-supabase_router = APIRouter()
+supabase_router = APIRouter(route_class=HeadersRoute)
 
 
 @supabase_router.post(path="/upload_files/{folder}")
 async def upload_files(
+    request: Request,
     folder: str,
     files: List[UploadFile] = File(...),
+    idempotency_key: Optional[str] = Header(
+        None,
+        alias=IDEMPOTENCY_KEY_HEADER,
+        max_length=255,
+        description="Unique per request, retries with the same key replay the first response",
+    ),
     user: UserDb = Depends(validate_role),
 ) -> dict[str, List[str]]:
     """Upload files to Supabase storage and return the file names"""
 
-    config = SupabaseStorageConfig(bucket=user.env, folder=folder)
-    file_names = await SupabaseDTO(config).upload_files(files)
+    # Read now, the upload may outlive the request, which closes its UploadFiles
+    uploads = [
+        StorageFile(
+            filename=file.filename,
+            content_type=file.content_type or "",
+            content=await file.read(),
+        )
+        for file in files
+    ]
+
+    async def upload() -> dict[str, List[str]]:
+        config = SupabaseStorageConfig(bucket=user.env, folder=folder)
+        file_names = await SupabaseDTO(config).upload_files(uploads)
+
+        return {"file_names": file_names}
+
+    # A key reused with other file contents is rejected, not replayed
+    payload = []
+    if idempotency_key is not None:
+        payload = [
+            (
+                upload_file.filename,
+                upload_file.content_type,
+                hashlib.sha256(upload_file.content).hexdigest(),
+            )
+            for upload_file in uploads
+        ]
 
-    return {"file_names": file_names}
+    return await idempotent_response(request, user, idempotency_key, payload, upload)
 
 
 class SupabaseDTO:
@@ -33,12 +79,12 @@ class SupabaseDTO:
         self.bucket = config.bucket
         self.folder = validate_folder(config.folder)
 
-    async def upload_files(self, files: List[UploadFile] = File(...)) -> List[str]:
+    async def upload_files(self, files: List[StorageFile]) -> List[str]:
         """
         Upload files to Supabase and return the file names.
 
         Args:
-            files (List[UploadFile]): The list of files to be uploaded.
+            files (List[StorageFile]): The list of files to be uploaded, read in memory.
 
         Returns:
             List[str]: The list of uploaded file names.
@@ -52,17 +98,17 @@ class SupabaseDTO:
                     status_code=400, detail="Upload image failed - Invalid file type"
                 )
 
-            file_bytes = await file.read()
-
-            self.supabase_client.storage.from_(self.bucket).upload(
-                path=f"{self.folder}/temp/{file.filename}",
-                file=file_bytes,
-                file_options={
-                    "cache-control": "3600",
-                    "upsert": "true",
-                    "content-type": file.content_type,
-                },
-            )
+            with supabase_call("upload"):
+                await db_executor.run(
+                    self.supabase_client.storage.from_(self.bucket).upload,
+                    path=f"{self.folder}/temp/{file.filename}",
+                    file=file.content,
+                    file_options={
+                        "cache-control": "3600",
+                        "upsert": "true",
+                        "content-type": file.content_type,
+                    },
+                )
 
             file_names.append(file.filename)
 
@@ -79,14 +125,15 @@ class SupabaseDTO:
             List[str]: The list of file names.
         """
 
-        files = self.supabase_client.storage.from_(self.bucket).list(
-            f"{self.folder}/{subfolder}",
-            {
-                "limit": 100,
-                "offset": 0,
-                "sortBy": {"column": "name", "order": "desc"},
-            },
-        )
+        with supabase_call("list"):
+            files = self.supabase_client.storage.from_(self.bucket).list(
+                f"{self.folder}/{subfolder}",
+                {
+                    "limit": 100,
+                    "offset": 0,
+                    "sortBy": {"column": "name", "order": "desc"},
+                },
+            )
 
         return [file["name"] for file in files] if files else []
 
@@ -100,10 +147,11 @@ class SupabaseDTO:
         """
 
         for file in files:
-            self.supabase_client.storage.from_(self.bucket).move(
-                f"{self.folder}/temp/{file}",
-                f"{self.folder}/{subfolder}/{file}",
-            )
+            with supabase_call("move"):
+                self.supabase_client.storage.from_(self.bucket).move(
+                    f"{self.folder}/temp/{file}",
+                    f"{self.folder}/{subfolder}/{file}",
+                )
 
     def delete_files(self, files: List[str], subfolder: str) -> None:
         """
@@ -116,7 +164,8 @@ class SupabaseDTO:
 
         files = [f"{self.folder}/{subfolder}/{file}" for file in files]
 
-        self.supabase_client.storage.from_(self.bucket).remove(files)
+        with supabase_call("remove"):
+            self.supabase_client.storage.from_(self.bucket).remove(files)
 
     def delete_folder(self, subfolder: str) -> None:
         """